@@ -0,0 +1,106 @@
+import argparse
+import csv
+import os
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game.game_logic import MinesweeperLogic
+from ai.solver import MinesweeperAI
+
+# 24 feature locali + 1 globale, come nei solver
+GRID_FEATURES = [f"cell_{r}_{c}" for r in range(-2, 3) for c in range(-2, 3) if not (r==0 and c==0)]
+DATASET_COLUMNS = GRID_FEATURES + ['global_density']
+
+
+def frontier_rows(ai):
+    """Una riga (feature + etichetta 'safe') per ogni cella di frontiera, con la verità da mine_positions."""
+    game = ai.game
+    frontier = set()
+    cells, nbrs = game.cells, game.neighbors
+    for i, cell in enumerate(cells):
+        if cell.is_revealed:
+            for j in nbrs[i]:
+                n = cells[j]
+                if not n.is_revealed and not n.is_flagged:
+                    frontier.add((n.r, n.c))
+    if not frontier:
+        return []
+
+    # La densità globale è la stessa per tutte le celle: la calcoliamo una volta sola
+    hidden_cells = game.rows * game.cols - game.revealed_count
+    density = (game.mines - game.flag_count) / hidden_cells if hidden_cells > 0 else 0.0
+
+    rows = []
+    for r, c in sorted(frontier):
+        features = [ai._get_effective_value(r + dr, c + dc)
+                    for dr in range(-2, 3) for dc in range(-2, 3) if dr or dc]
+        features.append(density)
+        features.append(0 if (r, c) in game.mine_positions else 1)
+        rows.append(features)
+    return rows
+
+
+def play_game(rows, cols, mines, guess_sweeps=100):
+    """Gioca una partita con il solver logico e ritorna le righe di tutti i punti di decisione."""
+    game = MinesweeperLogic(rows, cols, mines)
+    ai = MinesweeperAI(game, csv_filename=None)
+    ai.guess_max_sweeps = guess_sweeps
+    game.reveal(rows // 2, cols // 2)
+
+    data = []
+    steps = 0
+    while not game.game_over and steps < rows * cols * 2:
+        data.extend(frontier_rows(ai))
+        ai.step()
+        steps += 1
+    return data
+
+
+def generate_shard(shard_path, n_games, rows, cols, mines, seed, guess_sweeps=100):
+    """Worker: gioca n_games partite e scrive un singolo shard CSV. Ritorna il numero di righe."""
+    random.seed(seed)
+    written = 0
+    with open(shard_path, mode='w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(DATASET_COLUMNS + ['safe'])
+        for _ in range(n_games):
+            data = play_game(rows, cols, mines, guess_sweeps)
+            writer.writerows(data)
+            written += len(data)
+    return written
+
+
+def generate_dataset(out_dir, n_shards=8, games_per_shard=100, rows=16, cols=30, mines=99,
+                     workers=None, seed=0, guess_sweeps=100):
+    """Genera il dataset in parallelo (un processo per shard alla volta) dentro out_dir."""
+    os.makedirs(out_dir, exist_ok=True)
+    paths = [os.path.join(out_dir, f"shard_{i:05d}.csv") for i in range(n_shards)]
+    total = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(generate_shard, path, games_per_shard, rows, cols, mines,
+                               seed + i, guess_sweeps)
+                   for i, path in enumerate(paths)]
+        for path, future in zip(paths, futures):
+            written = future.result()
+            total += written
+            print(f"{os.path.basename(path)}: {written} righe")
+    print(f"Totale: {total} righe in {n_shards} shard")
+    return paths
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generatore parallelo di dataset con etichette su tutta la frontiera.")
+    parser.add_argument('--out', default='dataset_shards')
+    parser.add_argument('--shards', type=int, default=8)
+    parser.add_argument('--games', type=int, default=100, help="partite per shard")
+    parser.add_argument('--rows', type=int, default=16)
+    parser.add_argument('--cols', type=int, default=30)
+    parser.add_argument('--mines', type=int, default=99)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    generate_dataset(args.out, args.shards, args.games, args.rows, args.cols, args.mines,
+                     args.workers, args.seed)
@@ -0,0 +1,84 @@
+from ai.linear_logic import find_forced_cells
+
+
+def subset_deductions(game):
+    """Regola dei sottoinsiemi tra coppie di vincoli: ritorna (celle sicure, mine)."""
+    active_cells = []
+    cells, nbrs = game.cells, game.neighbors
+    for i, cell in game.known_cells():
+        if cell.is_revealed and cell.adjacent_mines > 0:
+            hidden = set()
+            flags = 0
+            for j in nbrs[i]:
+                n = cells[j]
+                if n.is_flagged: flags += 1
+                elif not n.is_revealed: hidden.add((n.r, n.c))
+            if hidden:
+                active_cells.append({
+                    'hidden': hidden,
+                    'remaining': cell.adjacent_mines - flags
+                })
+
+    safe, mines = set(), set()
+    for i in range(len(active_cells)):
+        for j in range(len(active_cells)):
+            if i == j: continue
+            A, B = active_cells[i], active_cells[j]
+
+            if A['hidden'].issubset(B['hidden']):
+                diff = B['hidden'] - A['hidden']
+                if not diff: continue
+                mine_diff = B['remaining'] - A['remaining']
+
+                if mine_diff == 0:
+                    safe.update(diff)
+                elif mine_diff == len(diff):
+                    mines.update(diff)
+    return safe, mines
+
+
+def apply_deductions(game, safe, mines):
+    """Applica le deduzioni con le operazioni in blocco; ritorna (rivelate, bandiere)."""
+    flagged = game.flag_many(mines)
+    revealed = game.reveal_many(safe)
+    return revealed, flagged
+
+
+def run_advanced_logic(game, apply=None):
+    """Regola dei sottoinsiemi, poi deduzioni su più vincoli insieme (eliminazione
+    di Gauss per componente). Applica la prima che trova qualcosa; ritorna True se
+    ha mosso. apply(safe, mines) permette al solver di aggiornare i propri contatori."""
+    if apply is None:
+        apply = lambda safe, mines: apply_deductions(game, safe, mines)
+    for deduce in (subset_deductions, find_forced_cells):
+        safe, mines = deduce(game)
+        if safe or mines:
+            apply(safe, mines)
+            return True
+    return False
+
+
+def solve_until_guess(game, basic_deductions, apply=None):
+    """Applica tutte le deduzioni finché non ne restano, senza mai tirare a indovinare.
+
+    basic_deductions() è la regola base del solver. Ritorna un riepilogo: passate
+    eseguite, celle rivelate, bandiere piazzate e se serve un guess per proseguire.
+    """
+    if apply is None:
+        apply = lambda safe, mines: apply_deductions(game, safe, mines)
+    summary = {'passes': 0, 'revealed': 0, 'flagged': 0, 'needs_guess': False}
+    stages = (basic_deductions, lambda: subset_deductions(game),
+              lambda: find_forced_cells(game))
+    while not game.game_over:
+        for deduce in stages:
+            safe, mines = deduce()
+            if safe or mines:
+                break
+        else:
+            summary['needs_guess'] = True
+            break
+        revealed, flagged = apply(safe, mines)
+        summary['passes'] += 1
+        summary['revealed'] += revealed
+        summary['flagged'] += flagged
+    return summary
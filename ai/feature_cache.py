@@ -0,0 +1,72 @@
+LOCAL_OFFSETS = [(dr, dc) for dr in range(-2, 3) for dc in range(-2, 3) if not (dr == 0 and dc == 0)]
+
+
+class FeatureCache:
+    """Cache incrementale delle 24 feature locali (5x5) di ogni cella.
+
+    Legge game.change_log e invalida solo ciò che può essere cambiato: il valore
+    effettivo di una cella dipende da lei e dalle bandiere dei vicini (raggio 1),
+    le feature di una cella dai valori effettivi nel suo 5x5, quindi una modifica
+    invalida le feature entro raggio 3 (il 5x5 più il raggio delle bandiere).
+    """
+
+    def __init__(self, game):
+        self.game = game
+        self._cursor = 0
+        self._epoch = getattr(game, 'log_epoch', 0)
+        self._values = {}
+        self._features = {}
+
+    def sync(self):
+        log = self.game.change_log
+        epoch = getattr(self.game, 'log_epoch', 0)
+        if epoch != self._epoch:
+            # Dopo un rollback il log è stato riscritto: si riparte da zero
+            self._values.clear()
+            self._features.clear()
+            self._epoch = epoch
+            self._cursor = len(log)
+            return
+        if self._cursor == len(log):
+            return
+        values, features = self._values, self._features
+        for r, c in log[self._cursor:]:
+            for dr in range(-3, 4):
+                for dc in range(-3, 4):
+                    key = (r + dr, c + dc)
+                    features.pop(key, None)
+                    if -1 <= dr <= 1 and -1 <= dc <= 1:
+                        values.pop(key, None)
+        self._cursor = len(log)
+
+    def effective_value(self, r, c):
+        """Stessa codifica di _get_effective_value: -2 fuori griglia, -1 nascosta."""
+        key = (r, c)
+        value = self._values.get(key)
+        if value is None:
+            game = self.game
+            if not (0 <= r < game.rows and 0 <= c < game.cols):
+                value = -2
+            else:
+                cell = game.board[r][c]
+                if not cell.is_revealed:
+                    value = -1
+                else:
+                    flags = 0
+                    cells = game.cells
+                    for j in game.neighbors[r * game.cols + c]:
+                        if cells[j].is_flagged: flags += 1
+                    value = cell.adjacent_mines - flags
+            self._values[key] = value
+        return value
+
+    def local_features(self, r, c):
+        """Le 24 feature locali della cella (tupla, da non modificare)."""
+        self.sync()
+        key = (r, c)
+        features = self._features.get(key)
+        if features is None:
+            features = tuple(self.effective_value(r + dr, c + dc) for dr, dc in LOCAL_OFFSETS)
+            self._features[key] = features
+        return features
+
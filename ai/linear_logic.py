@@ -0,0 +1,191 @@
+from fractions import Fraction
+
+# Oltre questo numero di celle una componente usa solo la forma a scala (vedi _reduce)
+FULL_REDUCTION_LIMIT = 100
+
+
+def build_constraints(game):
+    """Ritorna la lista dei vincoli di frontiera come (set di celle nascoste, mine rimanenti)."""
+    constraints = []
+    cells, nbrs = game.cells, game.neighbors
+    for i, cell in game.known_cells():
+        if not cell.is_revealed or cell.adjacent_mines == 0:
+            continue
+        hidden = []
+        flags = 0
+        for j in nbrs[i]:
+            n = cells[j]
+            if n.is_flagged:
+                flags += 1
+            elif not n.is_revealed:
+                hidden.append((n.r, n.c))
+        if hidden:
+            constraints.append((frozenset(hidden), cell.adjacent_mines - flags))
+    return constraints
+
+
+def split_components(constraints):
+    """Raggruppa i vincoli in componenti connesse (celle nascoste condivise)."""
+    parent = {}
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for hidden, _ in constraints:
+        cells = iter(hidden)
+        first = next(cells)
+        parent.setdefault(first, first)
+        root = find(first)
+        for cell in cells:
+            parent.setdefault(cell, cell)
+            other = find(cell)
+            if other != root:
+                parent[other] = root
+
+    groups = {}
+    for hidden, remaining in constraints:
+        root = find(next(iter(hidden)))
+        groups.setdefault(root, []).append((hidden, remaining))
+    return list(groups.values())
+
+
+def _reduce(rows, n_vars, full=True):
+    """Eliminazione di Gauss su righe sparse {colonna: coefficiente} con termine noto.
+
+    Un indice colonna -> righe permette di toccare solo le righe che contengono
+    la colonna del pivot. Con full=True la colonna viene eliminata anche dalle
+    righe pivot precedenti (Gauss-Jordan, forma ridotta): è la forma che trova
+    più deduzioni, ma su vincoli lunghi a catena le righe si riempiono e il
+    costo diventa quadratico. Con full=False si ottiene solo la forma a scala,
+    che resta sparsa e costa circa quanto il numero di vincoli.
+    """
+    coeffs = [dict(c) for c, _ in rows]
+    rhs = [r for _, r in rows]
+    by_col = {}
+    for i, row in enumerate(coeffs):
+        for j in row:
+            by_col.setdefault(j, set()).add(i)
+
+    pivots = []
+    used = set()
+    for col in range(n_vars):
+        holders = by_col.get(col)
+        if not holders:
+            continue
+        candidates = holders - used
+        if not candidates:
+            continue
+        pivot = min(candidates)
+        used.add(pivot)
+        pivots.append(pivot)
+        row = coeffs[pivot]
+        k = row[col]
+        if k != 1:
+            for j in row:
+                row[j] /= k
+            rhs[pivot] /= k
+        if not full:
+            # La riga pivot esce dal sistema: le sue colonne non la indicizzano più
+            for j in row:
+                by_col[j].discard(pivot)
+
+        targets = holders if full else candidates
+        for i in list(targets):
+            if i == pivot:
+                continue
+            other = coeffs[i]
+            f = other[col]
+            for j, v in row.items():
+                nv = other.get(j, 0) - f * v
+                if nv == 0:
+                    if j in other:
+                        del other[j]
+                        by_col[j].discard(i)
+                else:
+                    if j not in other:
+                        by_col.setdefault(j, set()).add(i)
+                    other[j] = nv
+            rhs[i] -= f * rhs[pivot]
+    return [(coeffs[i], rhs[i]) for i in pivots]
+
+
+def _bound_check(coeffs, rhs):
+    """Se il termine noto coincide con il minimo o il massimo della riga, tutte le variabili sono forzate."""
+    low = sum(v for v in coeffs.values() if v < 0)
+    high = sum(v for v in coeffs.values() if v > 0)
+    if rhs == low:
+        return {j: (1 if v < 0 else 0) for j, v in coeffs.items()}
+    if rhs == high:
+        return {j: (1 if v > 0 else 0) for j, v in coeffs.items()}
+    return {}
+
+
+def solve_component(component):
+    """Ritorna (celle sicure, mine) dedotte da una singola componente di vincoli."""
+    cells = sorted({cell for hidden, _ in component for cell in hidden})
+    index = {cell: i for i, cell in enumerate(cells)}
+    rows = [({index[cell]: Fraction(1) for cell in hidden}, Fraction(remaining))
+            for hidden, remaining in component]
+
+    known = {}
+    # Anche i vincoli originali: dopo l'eliminazione non tutti restano in una
+    # forma su cui il controllo dei limiti funziona
+    reduced = _reduce(rows, len(cells), full=len(cells) <= FULL_REDUCTION_LIMIT) + rows
+    rows_of = {}
+    for r, (coeffs, _) in enumerate(reduced):
+        for j in coeffs:
+            rows_of.setdefault(j, []).append(r)
+
+    # Propaga le assegnazioni trovate: una riga si ricontrolla solo quando una
+    # delle sue variabili diventa nota
+    pending = list(range(len(reduced)))
+    queued = set(pending)
+    while pending:
+        r = pending.pop()
+        queued.discard(r)
+        coeffs, rhs = reduced[r]
+        free = {}
+        for j, v in coeffs.items():
+            if j in known:
+                rhs -= v * known[j]
+            else:
+                free[j] = v
+        if not free:
+            continue
+        for j, value in _bound_check(free, rhs).items():
+            known[j] = value
+            for other in rows_of[j]:
+                if other not in queued:
+                    queued.add(other)
+                    pending.append(other)
+
+    safe = {cells[j] for j, v in known.items() if v == 0}
+    mines = {cells[j] for j, v in known.items() if v == 1}
+    return safe, mines
+
+
+def find_forced_cells(game):
+    """Deduzioni lineari sull'intera frontiera: ritorna (celle sicure, mine)."""
+    safe, mines = set(), set()
+    for component in split_components(build_constraints(game)):
+        s, m = solve_component(component)
+        safe |= s
+        mines |= m
+    if safe or mines:
+        return safe, mines
+
+    # Vincolo globale sul numero totale di mine
+    # (dai contatori: le celle nascoste si elencano solo se il vincolo decide)
+    n_hidden = game.rows * game.cols - game.revealed_count - game.flag_count
+    mines_left = game.mines - game.flag_count
+    if n_hidden and (mines_left == 0 or mines_left == n_hidden):
+        hidden = {(cell.r, cell.c) for cell in game.cells
+                  if not cell.is_revealed and not cell.is_flagged}
+        if mines_left == 0:
+            safe = hidden
+        else:
+            mines = hidden
+    return safe, mines
@@ -0,0 +1,40 @@
+from ai.sampling import MonteCarloEstimator
+
+
+def evaluate_guesses(game, candidates, layouts):
+    """Valuta ogni cella candidata su più layout ipotetici di mine.
+
+    Per ogni layout la board viene portata su quel layout e ogni candidata viene
+    rivelata e poi annullata con snapshot()/rollback(), senza copiare la griglia.
+    Ritorna {cella: (probabilità di sopravvivere, celle rivelate in media)}.
+    """
+    stats = {cell: [0, 0] for cell in candidates}
+    if not layouts:
+        return {}
+    base = game.snapshot()
+    try:
+        for layout in layouts:
+            game.set_hypothetical_mines(layout)
+            for cell in candidates:
+                token = game.snapshot()
+                before = game.revealed_count
+                game.reveal(*cell)
+                if not (game.game_over and not game.victory):
+                    stats[cell][0] += 1
+                    stats[cell][1] += game.revealed_count - before
+                game.rollback(token)
+            game.rollback(base)
+    finally:
+        game.rollback(base)
+    n = len(layouts)
+    return {cell: (survived / n, revealed / n) for cell, (survived, revealed) in stats.items()}
+
+
+def best_guess(game, candidates, n_layouts=50, estimator=None):
+    """Guess con la miglior sopravvivenza, a parità quello che apre più celle."""
+    estimator = estimator or MonteCarloEstimator(game)
+    layouts = estimator.sample_layouts(n_layouts)
+    scores = evaluate_guesses(game, candidates, layouts)
+    if not scores:
+        return None
+    return max(scores, key=lambda cell: scores[cell])
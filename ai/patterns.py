@@ -0,0 +1,210 @@
+import os
+import tempfile
+import zlib
+from array import array
+
+# Tabella precalcolata delle deduzioni locali.
+#
+# Le celle sono codificate come in _get_effective_value: fuori griglia, nascoste
+# o rivelate con valore effettivo (numero meno le bandiere vicine). Le bandiere
+# sono già sottratte dai valori effettivi, quindi per i pattern contano come
+# celle "non variabili" al pari di quelle fuori griglia o rivelate.
+#
+# - Tabella singola: i vicini 3x3 di un numero (maschera a 8 bit delle nascoste)
+#   più il suo valore effettivo.
+# - Tabelle a coppie: due numeri vicini A e B (spostamento in PAIR_OFFSETS), la
+#   maschera delle nascoste nell'unione dei due 3x3 e i due valori effettivi.
+#
+# Ogni voce è un intero: bit 0-15 celle sicure, bit 16-31 mine (nell'ordine della
+# finestra). La tabella si costruisce una volta (python -m ai.patterns) e viene
+# salvata compressa accanto a questo file.
+
+TABLE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pattern_table.bin')
+TABLE_VERSION = 1
+
+NEIGHBOR_OFFSETS = [(dr, dc) for dr in range(-1, 2) for dc in range(-1, 2) if dr or dc]
+PAIR_OFFSETS = [(0, 1), (1, 0), (1, 1), (1, -1)]
+
+# Cache globale delle tabelle (caricate una sola volta per processo)
+_TABLES = None
+
+
+def _pair_window(offset):
+    """Celle (relative ad A) dell'unione dei vicinati di A e B, escluse A e B."""
+    dr, dc = offset
+    cells = set((r, c) for r, c in NEIGHBOR_OFFSETS)
+    cells |= set((dr + r, dc + c) for r, c in NEIGHBOR_OFFSETS)
+    cells -= {(0, 0), (dr, dc)}
+    return sorted(cells)
+
+
+PAIR_WINDOWS = {offset: _pair_window(offset) for offset in PAIR_OFFSETS}
+
+
+def _region_masks(offset):
+    """Maschere delle celle solo di A, condivise e solo di B nella finestra della coppia."""
+    dr, dc = offset
+    only_a = shared = only_b = 0
+    for i, (r, c) in enumerate(PAIR_WINDOWS[offset]):
+        in_a = max(abs(r), abs(c)) == 1
+        in_b = max(abs(r - dr), abs(c - dc)) == 1
+        if in_a and in_b: shared |= 1 << i
+        elif in_a: only_a |= 1 << i
+        else: only_b |= 1 << i
+    return only_a, shared, only_b
+
+
+def _build_single():
+    table = array('I', bytes(4 * 256 * 9))
+    for mask in range(256):
+        n = bin(mask).count('1')
+        for a in range(9):
+            if a == 0:
+                table[mask * 9 + a] = mask
+            elif a == n:
+                table[mask * 9 + a] = mask << 16
+    return table
+
+
+def _build_pair(offset):
+    only_a, shared, only_b = _region_masks(offset)
+    size = 1 << len(PAIR_WINDOWS[offset])
+    table = array('I', bytes(4 * size * 81))
+    for mask in range(size):
+        ma, ms, mb = mask & only_a, mask & shared, mask & only_b
+        na, ns, nb = bin(ma).count('1'), bin(ms).count('1'), bin(mb).count('1')
+        for a in range(9):
+            for b in range(9):
+                # k = mine nella zona condivisa: deve essere compatibile con entrambi i numeri
+                k_min = max(0, a - na, b - nb)
+                k_max = min(ns, a, b)
+                if k_min > k_max:
+                    continue
+                safe = mines = 0
+                if a - k_max == na: mines |= ma
+                if a - k_min == 0: safe |= ma
+                if b - k_max == nb: mines |= mb
+                if b - k_min == 0: safe |= mb
+                if k_min == ns: mines |= ms
+                if k_max == 0: safe |= ms
+                table[(mask * 9 + a) * 9 + b] = safe | (mines << 16)
+    return table
+
+
+def build_tables(path=TABLE_FILE):
+    """Costruisce tutte le tabelle e le salva compresse in path."""
+    tables = {'single': _build_single()}
+    for offset in PAIR_OFFSETS:
+        tables[offset] = _build_pair(offset)
+
+    payload = bytearray()
+    payload += TABLE_VERSION.to_bytes(4, 'little')
+    for key in ['single'] + PAIR_OFFSETS:
+        data = tables[key].tobytes()
+        payload += len(data).to_bytes(4, 'little') + data
+    if path:
+        # File temporaneo e os.replace: processi che costruiscono la tabella in
+        # parallelo (es. i worker del dataset) non leggono mai un file a metà
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(zlib.compress(bytes(payload), 9))
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+    return tables
+
+
+def load_tables(path=TABLE_FILE):
+    """Carica le tabelle (una volta per processo), costruendole se il file manca o è vecchio."""
+    global _TABLES
+    if _TABLES is not None:
+        return _TABLES
+    tables = None
+    if os.path.exists(path):
+        try:
+            with open(path, 'rb') as f:
+                payload = zlib.decompress(f.read())
+            if int.from_bytes(payload[:4], 'little') == TABLE_VERSION:
+                tables = {}
+                pos = 4
+                for key in ['single'] + PAIR_OFFSETS:
+                    n = int.from_bytes(payload[pos:pos + 4], 'little')
+                    table = array('I')
+                    table.frombytes(payload[pos + 4:pos + 4 + n])
+                    tables[key] = table
+                    pos += 4 + n
+        except (OSError, zlib.error, ValueError):
+            tables = None
+    if tables is None:
+        try:
+            tables = build_tables(path)
+        except OSError:
+            tables = build_tables(None)
+    _TABLES = tables
+    return tables
+
+
+def find_local_deductions(game):
+    """Deduzioni dei pattern locali (regola base + coppie di numeri vicini) via lookup."""
+    tables = load_tables()
+    single = tables['single']
+    rows, cols = game.rows, game.cols
+    cells = game.cells
+
+    # Una passata sulle celle rivelate: valori effettivi dei numeri e celle
+    # nascoste vicine. Le finestre delle coppie stanno nei vicinati dei due
+    # numeri, quindi le nascoste raccolte qui bastano anche per le coppie.
+    hidden = set()
+    numbers = {}
+    for _, cell in game.known_cells():
+        if not cell.is_revealed or cell.is_mine:
+            continue
+        r, c = cell.r, cell.c
+        mask = 0
+        flags = 0
+        for i, (dr, dc) in enumerate(NEIGHBOR_OFFSETS):
+            nr, nc = r + dr, c + dc
+            if 0 <= nr < rows and 0 <= nc < cols:
+                n = cells[nr * cols + nc]
+                if n.is_flagged:
+                    flags += 1
+                elif not n.is_revealed:
+                    mask |= 1 << i
+                    hidden.add((nr, nc))
+        value = cell.adjacent_mines - flags
+        if mask and 0 <= value <= 8:
+            numbers[(r, c)] = (mask, value)
+
+    safe, mines = set(), set()
+
+    def collect(entry, window, r, c):
+        for i, (dr, dc) in enumerate(window):
+            if entry & (1 << i): safe.add((r + dr, c + dc))
+            if entry & (1 << (i + 16)): mines.add((r + dr, c + dc))
+
+    for (r, c), (mask, value) in numbers.items():
+        entry = single[mask * 9 + value]
+        if entry:
+            collect(entry, NEIGHBOR_OFFSETS, r, c)
+
+        for offset in PAIR_OFFSETS:
+            other = numbers.get((r + offset[0], c + offset[1]))
+            if other is None:
+                continue
+            window = PAIR_WINDOWS[offset]
+            pmask = 0
+            for i, (dr, dc) in enumerate(window):
+                if (r + dr, c + dc) in hidden:
+                    pmask |= 1 << i
+            entry = tables[offset][(pmask * 9 + value) * 9 + other[1]]
+            if entry:
+                collect(entry, window, r, c)
+
+    return safe, mines
+
+
+if __name__ == "__main__":
+    build_tables()
+    print(f"Tabella dei pattern salvata in {TABLE_FILE} ({os.path.getsize(TABLE_FILE)} byte)")
@@ -0,0 +1,223 @@
+import math
+import random
+import time
+
+from ai.linear_logic import build_constraints
+
+
+# Medie a blocchi per l'errore standard: i blocchi raddoppiano di dimensione
+# (unendoli a coppie) man mano che arrivano campioni, tenendone almeno
+# MIN_BATCHES e circa quanti è lunga la dimensione del blocco (regola della
+# radice: blocchi e numero di blocchi crescono entrambi come sqrt(campioni)).
+# Sotto MIN_BATCH_SIZE campioni per blocco la correlazione tra sweep vicini
+# rende l'errore troppo ottimistico e stderr() non lo riporta.
+MIN_BATCHES = 16
+MIN_BATCH_SIZE = 32
+
+
+class MonteCarloEstimator:
+    """Stima anytime delle probabilità di mina sulla frontiera tramite MCMC.
+
+    La catena esplora assegnazioni 0/1 delle celle di frontiera con energia pari
+    alla violazione totale dei vincoli; solo gli stati a energia zero vengono
+    campionati, quindi le stime convergono alla distribuzione esatta condizionata
+    ai vincoli (pesata per il numero di modi di piazzare le mine rimanenti
+    all'interno). Si può chiamare run() più volte: i campioni si accumulano.
+    """
+
+    def __init__(self, game, rng=None, beta=2.0):
+        self.rng = rng or random
+        self.beta = beta
+
+        constraints = build_constraints(game)
+        self.cells = sorted({cell for hidden, _ in constraints for cell in hidden})
+        index = {cell: i for i, cell in enumerate(self.cells)}
+        self.targets = [remaining for _, remaining in constraints]
+        self.var_cons = [[] for _ in self.cells]
+        for ci, (hidden, _) in enumerate(constraints):
+            for cell in hidden:
+                self.var_cons[index[cell]].append(ci)
+
+        # Interno dai contatori della partita: le sue celle servono solo a
+        # sample_layouts() e vengono elencate lì
+        self.game = game
+        self.flagged = [(cell.r, cell.c) for _, cell in game.known_cells() if cell.is_flagged]
+        hidden_total = game.rows * game.cols - game.revealed_count - len(self.flagged)
+        self.mines_left = game.mines - len(self.flagged)
+        self.interior = hidden_total - len(self.cells)
+        self._interior_cells = None
+
+        # Stato corrente della catena (tutte sicure all'inizio)
+        self.state = [0] * len(self.cells)
+        # Indici delle mine in una lista (scelta casuale O(1)) con la posizione
+        # di ciascuna, per rimuoverla scambiandola con l'ultima
+        self.mine_vars = []
+        self._mine_pos = [-1] * len(self.cells)
+        self.sums = [0] * len(self.targets)
+        self.energy = sum(abs(t) for t in self.targets)
+
+        # Accumulatori
+        self.counts = [0] * len(self.cells)
+        self.interior_sum = 0.0
+        self.samples = 0
+        # Medie a blocchi per l'errore standard (vedi MIN_BATCHES)
+        self.batch_size = 1
+        self.batches = []
+        self._batch_counts = [0] * len(self.cells)
+
+    def _log_weight(self, k):
+        """Log del numero di modi di piazzare le mine rimanenti fuori dalla frontiera.
+
+        Fuori dall'intervallo ammesso ritorna una penalità finita proporzionale alla
+        distanza, così la catena può rientrare (quegli stati non vengono campionati).
+        """
+        m = self.mines_left - k
+        u = self.interior
+        if m < 0 or m > u:
+            return -self.beta * (-m if m < 0 else m - u)
+        return math.lgamma(u + 1) - math.lgamma(m + 1) - math.lgamma(u - m + 1)
+
+    def _flip(self, j):
+        """Inverte la variabile j aggiornando le somme; ritorna la variazione di energia."""
+        d = -1 if self.state[j] else 1
+        self.state[j] += d
+        if d > 0:
+            self._mine_pos[j] = len(self.mine_vars)
+            self.mine_vars.append(j)
+        else:
+            pos, last = self._mine_pos[j], self.mine_vars.pop()
+            if last != j:
+                self.mine_vars[pos] = last
+                self._mine_pos[last] = pos
+            self._mine_pos[j] = -1
+        delta = 0
+        for ci in self.var_cons[j]:
+            s, t = self.sums[ci], self.targets[ci]
+            delta += abs(s + d - t) - abs(s - t)
+            self.sums[ci] = s + d
+        self.energy += delta
+        return delta
+
+    def _propose(self):
+        n = len(self.cells)
+        k = len(self.mine_vars)
+        # Il tipo di mossa non dipende dallo stato (proposta simmetrica): se non
+        # è applicabile la mossa viene semplicemente saltata
+        u = self.rng.random()
+        if u < 0.5:
+            if not 0 < k < n:
+                return
+            # Scambio: sposta una mina su una cella libera (k invariato)
+            a = self.rng.choice(self.mine_vars)
+            b = self.rng.randrange(n)
+            while self.state[b]:
+                b = self.rng.randrange(n)
+            if u < 0.25:
+                # Doppio scambio: due mine insieme, per passare tra configurazioni
+                # valide separate da stati che violano i vincoli (es. i 50/50)
+                if not 1 < k < n - 1:
+                    return
+                a2 = self.rng.choice(self.mine_vars)
+                while a2 == a:
+                    a2 = self.rng.choice(self.mine_vars)
+                b2 = self.rng.randrange(n)
+                while self.state[b2] or b2 == b:
+                    b2 = self.rng.randrange(n)
+                moved = (a, a2, b, b2)
+            else:
+                moved = (a, b)
+            new_k = k
+        else:
+            moved = (self.rng.randrange(n),)
+            new_k = k + (-1 if self.state[moved[0]] else 1)
+
+        delta = sum(self._flip(j) for j in moved)
+        log_accept = -self.beta * delta + self._log_weight(new_k) - self._log_weight(k)
+        if log_accept < 0 and self.rng.random() >= math.exp(log_accept):
+            for j in reversed(moved):
+                self._flip(j)
+
+    def run(self, deadline=None, max_sweeps=None):
+        """Esegue sweep della catena fino alla deadline (time.perf_counter) o a max_sweeps."""
+        if not self.cells:
+            return self.samples
+        sweeps = 0
+        n = len(self.cells)
+        while max_sweeps is None or sweeps < max_sweeps:
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            for _ in range(n):
+                self._propose()
+            sweeps += 1
+            if self.energy == 0 and 0 <= self.mines_left - len(self.mine_vars) <= self.interior:
+                for j in self.mine_vars:
+                    self.counts[j] += 1
+                    self._batch_counts[j] += 1
+                if self.interior > 0:
+                    self.interior_sum += (self.mines_left - len(self.mine_vars)) / self.interior
+                self.samples += 1
+                if self.samples % self.batch_size == 0:
+                    self.batches.append(self._batch_counts)
+                    self._batch_counts = [0] * len(self.cells)
+                    if len(self.batches) >= 2 * max(MIN_BATCHES, self.batch_size):
+                        self._merge_batches()
+        return self.samples
+
+    def _merge_batches(self):
+        """Unisce i blocchi a coppie raddoppiandone la dimensione."""
+        b = self.batches
+        self.batches = [[x + y for x, y in zip(b[i], b[i + 1])] for i in range(0, len(b) - 1, 2)]
+        self.batch_size *= 2
+
+    def sample_layouts(self, n, max_sweeps=10000):
+        """Fino a n layout completi di mine coerenti con la board (frontiera dalla
+        catena, interno uniforme, bandiere incluse), uno per sweep a energia zero."""
+        layouts = []
+        if not self.cells:
+            return layouts
+        if self._interior_cells is None:
+            frontier = set(self.cells)
+            self._interior_cells = [(cell.r, cell.c) for cell in self.game.cells
+                                    if not cell.is_revealed and not cell.is_flagged
+                                    and (cell.r, cell.c) not in frontier]
+        sweeps = 0
+        while len(layouts) < n and sweeps < max_sweeps:
+            for _ in range(len(self.cells)):
+                self._propose()
+            sweeps += 1
+            inner = self.mines_left - len(self.mine_vars)
+            if self.energy == 0 and 0 <= inner <= self.interior:
+                layout = {self.cells[j] for j in self.mine_vars}
+                layout.update(self.rng.sample(self._interior_cells, inner))
+                layout.update(self.flagged)
+                layouts.append(layout)
+        return layouts
+
+    def probabilities(self):
+        """Probabilità di mina stimata per ogni cella di frontiera ({} se nessun campione)."""
+        if not self.samples:
+            return {}
+        return {cell: self.counts[i] / self.samples for i, cell in enumerate(self.cells)}
+
+    def interior_probability(self):
+        """Probabilità di mina stimata per una cella nascosta non di frontiera."""
+        if not self.samples or self.interior <= 0:
+            return None
+        return self.interior_sum / self.samples
+
+    def stderr(self):
+        """Errore standard di ciascuna stima, con il metodo delle medie a blocchi.
+
+        Ritorna {} finché i blocchi non hanno almeno MIN_BATCH_SIZE campioni:
+        con blocchi più corti i campioni correlati lo renderebbero ottimistico.
+        """
+        if self.batch_size < MIN_BATCH_SIZE:
+            return {}
+        nb = len(self.batches)
+        result = {}
+        for i, cell in enumerate(self.cells):
+            means = [b[i] / self.batch_size for b in self.batches]
+            mu = sum(means) / nb
+            var = sum((x - mu) ** 2 for x in means) / (nb - 1)
+            result[cell] = math.sqrt(var / nb)
+        return result
@@ -1,5 +1,6 @@
 import random
 import sys
+import time
 import os
 import csv
 import tkinter as tk
@@ -7,19 +8,28 @@ import tkinter as tk
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from game.minesweeper import MinesweeperGUI
+from ai.deductions import apply_deductions, run_advanced_logic, solve_until_guess
+from ai.patterns import find_local_deductions
+from ai.sampling import MonteCarloEstimator
 
 class MinesweeperAI:
-    def __init__(self, game_logic):
+    def __init__(self, game_logic, csv_filename='minesweeper_dataset.csv'):
         self.game = game_logic
         self.running = False
-        self.csv_filename = 'minesweeper_dataset.csv'
+        # Tempo massimo (secondi) per la stima delle probabilità a ogni guess
+        self.guess_time_limit = 0.05
+        # Se impostato, la stima usa un numero fisso di sweep al posto del limite
+        # di tempo: le decisioni diventano riproducibili (vedi benchmarks/replay.py)
+        self.guess_max_sweeps = None
+        # None disattiva il salvataggio dei dati ai guess
+        self.csv_filename = csv_filename
         
         # 24 feature locali + 1 globale
         self.grid_features = [f"cell_{r}_{c}" for r in range(-2, 3) for c in range(-2, 3) if not (r==0 and c==0)]
         self.meta_features = ['global_density']
         self.dataset_columns = self.grid_features + self.meta_features
         
-        if not os.path.exists(self.csv_filename):
+        if self.csv_filename and not os.path.exists(self.csv_filename):
             try:
                 with open(self.csv_filename, mode='w', newline='') as f:
                     writer = csv.writer(f)
@@ -35,8 +45,10 @@ class MinesweeperAI:
         if not cell.is_revealed:
             return -1 
 
-        neighbors = self.game.get_neighbors(r, c)
-        current_flags = len([n for n in neighbors if self.game.board[n[0]][n[1]].is_flagged])
+        cells = self.game.cells
+        current_flags = 0
+        for j in self.game.neighbors[r * self.game.cols + c]:
+            if cells[j].is_flagged: current_flags += 1
         return cell.adjacent_mines - current_flags
 
     def _get_features_for_cell(self, r, c):
@@ -50,17 +62,9 @@ class MinesweeperAI:
                 features.append(val)
         
         # Feature Globale (Global Density)
-        flags_on_board = 0
-        revealed_on_board = 0
         total_cells = self.game.rows * self.game.cols
-        
-        for row in self.game.board:
-            for cell in row:
-                if cell.is_flagged: flags_on_board += 1
-                if cell.is_revealed: revealed_on_board += 1
-        
-        mines_left = self.game.mines - flags_on_board
-        hidden_cells = total_cells - revealed_on_board
+        mines_left = self.game.mines - self.game.flag_count
+        hidden_cells = total_cells - self.game.revealed_count
         
         if hidden_cells > 0:
             density = mines_left / hidden_cells
@@ -71,6 +75,7 @@ class MinesweeperAI:
         return features
 
     def _record_context(self, r, c, is_safe):
+        if not self.csv_filename: return
         data_row = self._get_features_for_cell(r, c)
         data_row.append(1 if is_safe else 0)
         
@@ -82,32 +87,11 @@ class MinesweeperAI:
 
     def step(self):
         if self.game.game_over: return False
-        made_move = False
-        
         # 1. Logica Base
-        for r in range(self.game.rows):
-            for c in range(self.game.cols):
-                if self.game.game_over: return False
-                cell = self.game.board[r][c]
-                
-                if cell.is_revealed and cell.adjacent_mines > 0:
-                    neighbors = [self.game.board[nr][nc] for nr, nc in self.game.get_neighbors(r, c)]
-                    hidden = [(n.r, n.c) for n in neighbors if not n.is_revealed and not n.is_flagged]
-                    flags = len([n for n in neighbors if n.is_flagged])
-                    
-                    if not hidden: continue
-                        
-                    if len(hidden) == cell.adjacent_mines - flags:
-                        for hr, hc in hidden:
-                            self.game.toggle_flag(hr, hc)
-                            made_move = True
-                            
-                    elif cell.adjacent_mines == flags:
-                        for hr, hc in hidden:
-                            self.game.reveal(hr, hc)
-                            made_move = True
-
-        if made_move: return True
+        safe, mines = self._basic_deductions()
+        if safe or mines:
+            self._apply_deductions(safe, mines)
+            return True
 
         # 2. Logica Avanzata
         if self.run_advanced_logic(): return True
@@ -116,62 +100,52 @@ class MinesweeperAI:
         self.make_guess()
         return True
 
+    def _basic_deductions(self):
+        """Regola base e pattern tra numeri vicini: ritorna (celle sicure, mine).
+        Usa la tabella precalcolata di ai/patterns.py, quindi è un lookup per numero."""
+        return find_local_deductions(self.game)
+
+    def _apply_deductions(self, safe, mines):
+        """Applica le deduzioni con le operazioni in blocco; ritorna (rivelate, bandiere)."""
+        revealed, flagged = apply_deductions(self.game, safe, mines)
+        return revealed, flagged
+
     def run_advanced_logic(self):
-        active_cells = []
-        for r in range(self.game.rows):
-            for c in range(self.game.cols):
-                cell = self.game.board[r][c]
-                if cell.is_revealed and cell.adjacent_mines > 0:
-                     neighbors = self.game.get_neighbors(r, c)
-                     hidden = [(nr, nc) for nr, nc in neighbors 
-                               if not self.game.board[nr][nc].is_revealed 
-                               and not self.game.board[nr][nc].is_flagged]
-                     if hidden:
-                         flags = len([n for n in neighbors if self.game.board[n[0]][n[1]].is_flagged])
-                         active_cells.append({
-                             'hidden': set(hidden),
-                             'remaining': cell.adjacent_mines - flags
-                         })
-        
-        made_move = False
-        for i in range(len(active_cells)):
-            for j in range(len(active_cells)):
-                if i == j: continue
-                A, B = active_cells[i], active_cells[j]
-                
-                if A['hidden'].issubset(B['hidden']):
-                    diff = B['hidden'] - A['hidden']
-                    if not diff: continue
-                    mine_diff = B['remaining'] - A['remaining']
-                    
-                    if mine_diff == 0:
-                        for dr, dc in diff:
-                            self.game.reveal(dr, dc)
-                            made_move = True
-                    elif mine_diff == len(diff):
-                        for dr, dc in diff:
-                            self.game.toggle_flag(dr, dc)
-                            made_move = True
-        return made_move
+        return run_advanced_logic(self.game, self._apply_deductions)
+
+    def solve_until_guess(self):
+        """Deduzioni ripetute fino al primo guess necessario (vedi ai/deductions.py)."""
+        return solve_until_guess(self.game, self._basic_deductions, self._apply_deductions)
 
     def make_guess(self):
+        game = self.game
         frontier = set()
-        for r in range(self.game.rows):
-            for c in range(self.game.cols):
-                if self.game.board[r][c].is_revealed:
-                    for nr, nc in self.game.get_neighbors(r, c):
-                        if not self.game.board[nr][nc].is_revealed and not self.game.board[nr][nc].is_flagged:
-                            frontier.add((nr, nc))
+        cells, nbrs = game.cells, game.neighbors
+        for i, cell in game.known_cells():
+            if cell.is_revealed:
+                for j in nbrs[i]:
+                    n = cells[j]
+                    if not n.is_revealed and not n.is_flagged:
+                        frontier.add((n.r, n.c))
+        if game.rows * game.cols - game.revealed_count - game.flag_count == 0: return
+
         if frontier:
-            gr, gc = random.choice(list(frontier))
+            # Stima Monte-Carlo entro il limite di tempo, poi la cella meno rischiosa
+            estimator = MonteCarloEstimator(self.game)
+            if self.guess_max_sweeps is not None:
+                estimator.run(max_sweeps=self.guess_max_sweeps)
+            else:
+                estimator.run(deadline=time.perf_counter() + self.guess_time_limit)
+            probs = estimator.probabilities()
+            if probs:
+                gr, gc = min(probs, key=probs.get)
+                p_interior = estimator.interior_probability()
+                if p_interior is not None and p_interior < probs[(gr, gc)]:
+                    gr, gc = game.random_hidden_cell(exclude=frontier) or (gr, gc)
+            else:
+                gr, gc = random.choice(list(frontier))
         else:
-            hidden = []
-            for r in range(self.game.rows):
-                for c in range(self.game.cols):
-                    if not self.game.board[r][c].is_revealed and not self.game.board[r][c].is_flagged:
-                        hidden.append((r, c))
-            if not hidden: return
-            gr, gc = random.choice(hidden)
+            gr, gc = game.random_hidden_cell()
             
         is_safe = not self.game.board[gr][gc].is_mine
         
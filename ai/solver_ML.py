@@ -16,15 +16,21 @@ CSV_FILE = 'minesweeper_dataset.csv'
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from game.minesweeper import MinesweeperGUI
+from ai.deductions import apply_deductions, run_advanced_logic, solve_until_guess
+from ai.patterns import find_local_deductions
+from ai.feature_cache import FeatureCache
 
 class MinesweeperAI:
-    def __init__(self, game_logic):
+    def __init__(self, game_logic, csv_filename=CSV_FILE):
         self.game = game_logic
         self.running = False
+        # None disattiva il salvataggio dei dati ai guess
+        self.csv_filename = csv_filename
         
         # --- TRACKING INTERNO ---
         # Teniamo il conto noi per evitare cicli inutili
         self.flags_count = 0 
+        self.feature_cache = FeatureCache(game_logic)
         
         # --- DEFINIZIONE FEATURE ---
         self.grid_features = [f"cell_{r}_{c}" for r in range(-2, 3) for c in range(-2, 3) if not (r==0 and c==0)]
@@ -50,42 +56,16 @@ class MinesweeperAI:
                     print(f"AI: Errore caricamento modello: {e}")
         self.model = _CACHED_MODEL
 
-    def _place_flag(self, r, c):
-        """Wrapper per piazzare bandiere e aggiornare il conteggio."""
-        if not self.game.board[r][c].is_flagged:
-            self.game.toggle_flag(r, c)
-            self.flags_count += 1
-
-    def _get_effective_value(self, r, c):
-        if not (0 <= r < self.game.rows and 0 <= c < self.game.cols): return -2
-        cell = self.game.board[r][c]
-        if not cell.is_revealed: return -1
-
-        neighbors = self.game.get_neighbors(r, c)
-        # Qui usiamo ancora un mini-ciclo locale perché i vicini sono solo max 8 (trascurabile)
-        current_flags = len([n for n in neighbors if self.game.board[n[0]][n[1]].is_flagged])
-        return cell.adjacent_mines - current_flags
-
     def _get_features_for_cell(self, r, c):
-        features = []
-        
-        # A. Feature Locali
-        for dr in range(-2, 3):
-            for dc in range(-2, 3):
-                if dr == 0 and dc == 0: continue
-                val = self._get_effective_value(r + dr, c + dc)
-                features.append(val)
+        # A. Feature Locali (dalla cache incrementale, invalidata solo vicino alle modifiche)
+        features = list(self.feature_cache.local_features(r, c))
         
         # B. Feature Globale: Global Density
         # Mine rimaste (basato sul nostro contatore veloce)
         mines_left = self.game.mines - self.flags_count
         
-        # Celle rivelate (Dobbiamo contarle per forza a causa del Flood Fill, ma usiamo sum veloce)
-        # Se modifichi game_logic per avere self.game.revealed_count, usa quello!
         total_cells = self.game.rows * self.game.cols
-        revealed_count = sum(cell.is_revealed for row in self.game.board for cell in row)
-        
-        hidden_cells = total_cells - revealed_count
+        hidden_cells = total_cells - self.game.revealed_count
         
         if hidden_cells > 0:
             density = mines_left / hidden_cells
@@ -96,9 +76,11 @@ class MinesweeperAI:
         return features
 
     def _save_dataset(self, features, label):
+        if not self.csv_filename:
+            return
         try:
-            file_exists = os.path.isfile(CSV_FILE)
-            with open(CSV_FILE, mode='a', newline='') as f:
+            file_exists = os.path.isfile(self.csv_filename)
+            with open(self.csv_filename, mode='a', newline='') as f:
                 writer = csv.writer(f)
                 if not file_exists:
                     writer.writerow(self.dataset_columns + ['safe'])
@@ -108,32 +90,11 @@ class MinesweeperAI:
 
     def step(self):
         if self.game.game_over: return False
-        made_move = False
-        
         # 1. Logica Base
-        for r in range(self.game.rows):
-            for c in range(self.game.cols):
-                if self.game.game_over: return False
-                cell = self.game.board[r][c]
-                
-                if cell.is_revealed and cell.adjacent_mines > 0:
-                    neighbors = [self.game.board[nr][nc] for nr, nc in self.game.get_neighbors(r, c)]
-                    hidden = [(n.r, n.c) for n in neighbors if not n.is_revealed and not n.is_flagged]
-                    flags = len([n for n in neighbors if n.is_flagged])
-                    
-                    if not hidden: continue
-                        
-                    if len(hidden) == cell.adjacent_mines - flags:
-                        for hr, hc in hidden:
-                            self._place_flag(hr, hc) # Usa il wrapper!
-                            made_move = True
-                            
-                    elif cell.adjacent_mines == flags:
-                        for hr, hc in hidden:
-                            self.game.reveal(hr, hc)
-                            made_move = True
-
-        if made_move: return True
+        safe, mines = self._basic_deductions()
+        if safe or mines:
+            self._apply_deductions(safe, mines)
+            return True
 
         # 2. Logica Avanzata
         if self.run_advanced_logic(): return True
@@ -142,65 +103,68 @@ class MinesweeperAI:
         self.make_guess_with_ml()
         return True
 
+    def _basic_deductions(self):
+        """Regola base e pattern tra numeri vicini: ritorna (celle sicure, mine).
+        Usa la tabella precalcolata di ai/patterns.py, quindi è un lookup per numero."""
+        return find_local_deductions(self.game)
+
+    def _apply_deductions(self, safe, mines):
+        """Applica le deduzioni con le operazioni in blocco; ritorna (rivelate, bandiere)."""
+        revealed, flagged = apply_deductions(self.game, safe, mines)
+        self.flags_count += flagged
+        return revealed, flagged
+
     def run_advanced_logic(self):
-        active_cells = []
-        for r in range(self.game.rows):
-            for c in range(self.game.cols):
-                cell = self.game.board[r][c]
-                if cell.is_revealed and cell.adjacent_mines > 0:
-                     neighbors = self.game.get_neighbors(r, c)
-                     hidden = [(nr, nc) for nr, nc in neighbors 
-                               if not self.game.board[nr][nc].is_revealed 
-                               and not self.game.board[nr][nc].is_flagged]
-                     if hidden:
-                         flags = len([n for n in neighbors if self.game.board[n[0]][n[1]].is_flagged])
-                         active_cells.append({
-                             'hidden': set(hidden),
-                             'remaining': cell.adjacent_mines - flags
-                         })
-        
-        made_move = False
-        for i in range(len(active_cells)):
-            for j in range(len(active_cells)):
-                if i == j: continue
-                A, B = active_cells[i], active_cells[j]
-                
-                if A['hidden'].issubset(B['hidden']):
-                    diff = B['hidden'] - A['hidden']
-                    if not diff: continue
-                    mine_diff = B['remaining'] - A['remaining']
-                    
-                    if mine_diff == 0:
-                        for dr, dc in diff:
-                            self.game.reveal(dr, dc)
-                            made_move = True
-                    elif mine_diff == len(diff):
-                        for dr, dc in diff:
-                            self._place_flag(dr, dc) # Usa il wrapper!
-                            made_move = True
-        return made_move
+        return run_advanced_logic(self.game, self._apply_deductions)
 
-    def make_guess_with_ml(self):
+    def solve_until_guess(self):
+        """Deduzioni ripetute fino al primo guess necessario (vedi ai/deductions.py)."""
+        return solve_until_guess(self.game, self._basic_deductions, self._apply_deductions)
+
+    def _guess_candidates(self):
+        """Celle tra cui scegliere il guess: la frontiera o, se vuota, tutte le nascoste."""
         frontier = set()
-        for r in range(self.game.rows):
-            for c in range(self.game.cols):
-                if self.game.board[r][c].is_revealed:
-                    for nr, nc in self.game.get_neighbors(r, c):
-                        if not self.game.board[nr][nc].is_revealed and not self.game.board[nr][nc].is_flagged:
-                            frontier.add((nr, nc))
+        cells, nbrs = self.game.cells, self.game.neighbors
+        for i, cell in self.game.known_cells():
+            if cell.is_revealed:
+                for j in nbrs[i]:
+                    n = cells[j]
+                    if not n.is_revealed and not n.is_flagged:
+                        frontier.add((n.r, n.c))
         
         frontier_list = list(frontier)
         
         if not frontier_list:
-            hidden = []
-            for r in range(self.game.rows):
-                for c in range(self.game.cols):
-                    if not self.game.board[r][c].is_revealed and not self.game.board[r][c].is_flagged:
-                        hidden.append((r, c))
-            if not hidden: return
+            hidden = [(cell.r, cell.c) for cell in self.game.cells
+                      if not cell.is_revealed and not cell.is_flagged]
             frontier_list = hidden
+        return frontier_list
+
+    def _predict_safe(self, features_batch):
+        """Probabilità di sicurezza per un batch di feature (None se il modello non è disponibile)."""
+        if not self.model:
+            return None
+        X_input = pd.DataFrame(features_batch, columns=self.dataset_columns)
+        try:
+            return self.model.predict_proba(X_input)[:, 1]
+        except Exception:
+            return None
+
+    def _execute_guess(self, move, move_features=None):
+        if move_features is None:
+            move_features = self._get_features_for_cell(move[0], move[1])
+        self.game.reveal(move[0], move[1])
+        label = 1 
+        if self.game.game_over and not self.game.victory:
+            label = 0 
+        self._save_dataset(move_features, label)
+
+    def make_guess_with_ml(self):
+        frontier_list = self._guess_candidates()
+        if not frontier_list: return
 
         best_move = None
+        move_features = None
         
         # --- PREDIZIONE ---
         if self.model:
@@ -208,26 +172,17 @@ class MinesweeperAI:
             for r, c in frontier_list:
                 features_batch.append(self._get_features_for_cell(r, c))
             
-            X_input = pd.DataFrame(features_batch, columns=self.dataset_columns)
-            
-            try:
-                probs = self.model.predict_proba(X_input)
-                safe_probs = probs[:, 1]
+            safe_probs = self._predict_safe(features_batch)
+            if safe_probs is not None:
                 best_idx = safe_probs.argmax()
                 best_move = frontier_list[best_idx]
-            except Exception:
-                best_move = random.choice(frontier_list)
-        else:
+                move_features = features_batch[best_idx]
+
+        if best_move is None:
             best_move = random.choice(frontier_list)
 
         # --- ESECUZIONE ---
-        if best_move:
-            move_features = self._get_features_for_cell(best_move[0], best_move[1])
-            self.game.reveal(best_move[0], best_move[1])
-            label = 1 
-            if self.game.game_over and not self.game.victory:
-                label = 0 
-            self._save_dataset(move_features, label)
+        self._execute_guess(best_move, move_features)
 
     def run_gui_loop(self, root, gui_update_callback):
         if not self.running:
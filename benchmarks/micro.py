@@ -0,0 +1,211 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import warnings
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game.game_logic import MinesweeperLogic
+from ai.solver import MinesweeperAI
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+# (rows, cols, mines) su cui girano i benchmark della board
+SIZES = [(9, 9, 10), (16, 16, 40), (16, 30, 99)]
+
+
+def _fresh_game(rows, cols, mines, seed):
+    return MinesweeperLogic(rows, cols, mines, seed=seed)
+
+
+def _started_game(rows, cols, mines, seed):
+    """Partita dopo il primo click al centro (stesso layout a parità di seed)."""
+    game = _fresh_game(rows, cols, mines, seed)
+    game.reveal(rows // 2, cols // 2)
+    return game
+
+
+def _midgame(rows, cols, mines, seed):
+    """Partita avanzata con la sola logica finché serve un guess: tipico punto di decisione."""
+    game = _started_game(rows, cols, mines, seed)
+    ai = MinesweeperAI(game, csv_filename=None)
+    ai.solve_until_guess()
+    return game, ai
+
+
+def _bench_place_mines(rows, cols, mines, seed):
+    game = _fresh_game(rows, cols, mines, seed)
+    return lambda: game.place_mines(rows // 2, cols // 2)
+
+
+def _bench_reveal_zero_region(rows, cols, mines, seed):
+    # Poche mine: il primo click apre quasi tutta la griglia con il flood fill
+    game = _fresh_game(rows, cols, max(1, mines // 10), seed)
+    return lambda: game.reveal(rows // 2, cols // 2)
+
+
+def _bench_get_neighbors(rows, cols, mines, seed):
+    game = _fresh_game(rows, cols, mines, seed)
+
+    def run():
+        for r in range(rows):
+            for c in range(cols):
+                game.get_neighbors(r, c)
+    return run
+
+
+def _bench_step(rows, cols, mines, seed):
+    game = _started_game(rows, cols, mines, seed)
+    ai = MinesweeperAI(game, csv_filename=None)
+    return ai.step
+
+
+def _bench_run_advanced_logic(rows, cols, mines, seed):
+    _, ai = _midgame(rows, cols, mines, seed)
+    return ai.run_advanced_logic
+
+
+def _bench_features(rows, cols, mines, seed):
+    game, ai = _midgame(rows, cols, mines, seed)
+    hidden = [(r, c) for r in range(rows) for c in range(cols)
+              if not game.board[r][c].is_revealed][:50]
+    return lambda: [ai._get_features_for_cell(r, c) for r, c in hidden]
+
+
+# Modelli già addestrati, per seed (l'addestramento non fa parte della misura)
+_MODELS = {}
+
+
+def _bench_model_inference(rows, cols, mines, seed):
+    """predict_proba su un batch di frontiera, con la stessa pipeline MLP di solver_MLP."""
+    try:
+        import numpy as np
+        from sklearn.neural_network import MLPClassifier
+        from sklearn.preprocessing import StandardScaler
+        from sklearn.pipeline import Pipeline
+    except ImportError:
+        return None
+    rng = np.random.RandomState(seed)
+    X = rng.randint(-2, 9, size=(2000, 25)).astype(float)
+    model = _MODELS.get(seed)
+    if model is None:
+        y = rng.randint(0, 2, size=2000)
+        model = Pipeline([
+            ('scaler', StandardScaler()),
+            ('mlp', MLPClassifier(hidden_layer_sizes=(64, 32), max_iter=5, random_state=seed)),
+        ])
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            model.fit(X, y)
+        _MODELS[seed] = model
+    batch = X[:2 * (rows + cols)]
+    return lambda: model.predict_proba(batch)
+
+
+BENCHMARKS = {
+    'place_mines': _bench_place_mines,
+    'reveal_zero_region': _bench_reveal_zero_region,
+    'get_neighbors_full_board': _bench_get_neighbors,
+    'step': _bench_step,
+    'run_advanced_logic': _bench_run_advanced_logic,
+    'features_50_cells': _bench_features,
+    'model_inference': _bench_model_inference,
+}
+
+
+def measure(factory, rows, cols, mines, seeds, repeat, min_sample=0.005):
+    """Misura la latenza di una chiamata; il setup (factory) è fuori dal tempo misurato.
+
+    Una prima chiamata di riscaldamento non viene contata (tabella dei pattern,
+    import, cache). Ogni campione cronometra abbastanza chiamate, ognuna sul
+    proprio stato preparato, da durare almeno min_sample secondi: le primitive
+    sotto il millisecondo non dipendono dalla risoluzione di un singolo timer.
+    """
+    fn = factory(rows, cols, mines, seeds[0])
+    if fn is None:
+        return None
+    fn()
+    fn = factory(rows, cols, mines, seeds[0])
+    t0 = time.perf_counter()
+    fn()
+    single = time.perf_counter() - t0
+    inner = max(1, min(1000, int(min_sample / max(single, 1e-7))))
+
+    timings = []
+    for seed in seeds:
+        for _ in range(repeat):
+            fns = [factory(rows, cols, mines, seed) for _ in range(inner)]
+            t0 = time.perf_counter()
+            for fn in fns:
+                fn()
+            timings.append((time.perf_counter() - t0) / inner)
+    median = statistics.median(timings)
+    return {
+        'calls': len(timings) * inner,
+        'inner': inner,
+        'median_ms': median * 1000,
+        'min_ms': min(timings) * 1000,
+        'ops_per_sec': len(timings) / sum(timings) if sum(timings) > 0 else float('inf'),
+    }
+
+
+def run_suite(names=None, seeds=(0, 1, 2), repeat=5):
+    results = {}
+    for name, factory in BENCHMARKS.items():
+        if names and name not in names:
+            continue
+        for rows, cols, mines in SIZES:
+            key = f"{name}[{rows}x{cols}x{mines}]"
+            res = measure(factory, rows, cols, mines, seeds, repeat)
+            if res is None:
+                print(f"{key:45s} saltato (dipendenze mancanti)")
+                continue
+            results[key] = res
+            print(f"{key:45s} {res['median_ms']:10.3f} ms  {res['ops_per_sec']:12.1f} op/s")
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Ritorna la lista di regressioni: mediana oltre baseline * (1 + threshold)."""
+    regressions = []
+    for key, res in results.items():
+        base = baseline.get('results', {}).get(key)
+        if not base:
+            continue
+        ratio = res['median_ms'] / base['median_ms'] if base['median_ms'] > 0 else 1.0
+        if ratio > 1 + threshold:
+            regressions.append((key, base['median_ms'], res['median_ms'], ratio))
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Micro-benchmark delle primitive di gioco e dei solver.")
+    parser.add_argument('--baseline', default=BASELINE_FILE)
+    parser.add_argument('--save-baseline', action='store_true', help="salva i risultati come nuova baseline")
+    parser.add_argument('--threshold', type=float, default=0.25, help="rallentamento tollerato (0.25 = +25%%)")
+    parser.add_argument('--only', nargs='*', help="nomi dei benchmark da eseguire")
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    results = run_suite(args.only, repeat=args.repeat)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump({'python': platform.python_version(), 'machine': platform.machine(),
+                       'results': results}, f, indent=2, sort_keys=True)
+        print(f"Baseline salvata: {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for key, old, new, ratio in regressions:
+            print(f"REGRESSIONE {key}: {old:.3f} ms -> {new:.3f} ms (x{ratio:.2f})")
+        if regressions:
+            sys.exit(1)
+        print("Nessuna regressione rispetto alla baseline.")
+    else:
+        print(f"Nessuna baseline in {args.baseline}: usa --save-baseline per crearla.")
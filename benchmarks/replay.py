@@ -0,0 +1,86 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game.game_logic import MinesweeperLogic
+from game.replay import ReplayReader, ReplayWriter, compare, new_game
+from ai.solver import MinesweeperAI
+
+
+def play(game, guess_sweeps=200):
+    """Gioca la partita con il solver logico e ritorna il tempo impiegato.
+
+    Il random globale (usato dai guess) viene inizializzato con il seed della
+    partita e la stima Monte-Carlo usa un numero fisso di sweep, così le scelte
+    del solver sono riproducibili e due versioni si confrontano mossa per mossa.
+    """
+    random.seed(game.seed)
+    ai = MinesweeperAI(game, csv_filename=None)
+    ai.guess_max_sweeps = guess_sweeps
+    t0 = time.perf_counter()
+    game.reveal(game.rows // 2, game.cols // 2)
+    steps = 0
+    while not game.game_over and steps < game.rows * game.cols * 2:
+        if ai.solve_until_guess()['needs_guess']:
+            ai.make_guess()
+        steps += 1
+    return time.perf_counter() - t0
+
+
+def record_games(path, n_games, rows=16, cols=30, mines=99, seed=0, guess_sweeps=200):
+    """Gioca n_games partite (seed consecutivi a partire da seed) e le accoda al log."""
+    with ReplayWriter(path) as writer:
+        for i in range(n_games):
+            game = MinesweeperLogic(rows, cols, mines, seed=seed + i)
+            writer.add(game, play(game, guess_sweeps))
+
+
+def compare_games(path, guess_sweeps=200):
+    """Rigioca ogni partita del log con il solver attuale. Generatore di confronti."""
+    with ReplayReader(path) as reader:
+        for record in reader:
+            game = new_game(record)
+            elapsed = play(game, guess_sweeps)
+            yield compare(record, game, elapsed)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Registra partite del solver e le confronta con una nuova versione.")
+    sub = parser.add_subparsers(dest='command', required=True)
+    rec = sub.add_parser('record', help="gioca e registra partite")
+    rec.add_argument('log')
+    rec.add_argument('--games', type=int, default=100)
+    rec.add_argument('--size', default='16x30', help="RIGHExCOLONNE")
+    rec.add_argument('--mines', type=int, default=99)
+    rec.add_argument('--seed', type=int, default=0)
+    cmp_ = sub.add_parser('compare', help="rigioca il log con il solver attuale")
+    cmp_.add_argument('log')
+    for p in (rec, cmp_):
+        p.add_argument('--guess-sweeps', type=int, default=200, help="sweep Monte-Carlo per guess")
+    args = parser.parse_args()
+
+    if args.command == 'record':
+        rows, cols = (int(x) for x in args.size.split('x'))
+        record_games(args.log, args.games, rows, cols, args.mines, args.seed, args.guess_sweeps)
+        print(f"{args.games} partite registrate in {args.log}")
+    else:
+        n = same = 0
+        old_time = new_time = 0.0
+        old_wins = new_wins = 0
+        for result in compare_games(args.log, args.guess_sweeps):
+            n += 1
+            same += result['divergence'] is None
+            old_time += result['elapsed_old']
+            new_time += result['elapsed_new']
+            old_wins += result['victory_old']
+            new_wins += result['victory_new']
+            if result['divergence'] is not None:
+                print(f"seed {result['seed']}: prima differenza alla mossa {result['divergence']} "
+                      f"(vittoria {result['victory_old']} -> {result['victory_new']})")
+        if n:
+            print(f"Partite: {n}, identiche: {same}, vittorie {old_wins} -> {new_wins}, "
+                  f"tempo medio {old_time / n * 1000:.1f} ms -> {new_time / n * 1000:.1f} ms")
@@ -0,0 +1,120 @@
+import argparse
+import math
+import os
+import random
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game.game_logic import MinesweeperLogic
+from ai.solver import MinesweeperAI
+
+
+def wilson_interval(wins, games, z=1.96):
+    """Intervallo di confidenza di Wilson per la win rate."""
+    if games == 0:
+        return 0.0, 1.0
+    p = wins / games
+    denom = 1 + z * z / games
+    center = (p + z * z / (2 * games)) / denom
+    half = z * math.sqrt(p * (1 - p) / games + z * z / (4 * games * games)) / denom
+    return max(0.0, center - half), min(1.0, center + half)
+
+
+def play_batch(rows, cols, mines, n_games, seed, guess_sweeps=100):
+    """Worker: gioca n_games partite con il solver logico e ritorna le vittorie."""
+    random.seed(seed)
+    wins = 0
+    for _ in range(n_games):
+        game = MinesweeperLogic(rows, cols, mines)
+        ai = MinesweeperAI(game, csv_filename=None)
+        ai.guess_max_sweeps = guess_sweeps
+        game.reveal(rows // 2, cols // 2)
+        steps = 0
+        while not game.game_over and steps < rows * cols * 2:
+            if ai.solve_until_guess()['needs_guess']:
+                ai.make_guess()
+            steps += 1
+        wins += game.victory
+    return wins
+
+
+def sweep(sizes, percentages, target_width=0.2, batch=10, min_games=20, max_games=1000,
+          workers=None, seed=0):
+    """Sweep adattivo e parallelo della win rate su densità x dimensioni.
+
+    Ogni punto riceve batch di partite finché l'intervallo di Wilson non è più
+    stretto di target_width (o si arriva a max_games). Il default 0.2 è la
+    precisione che danno 100 partite a win rate 0.5 (larghezza di Wilson ~0.19):
+    i punti vicini a 0% o 100% si fermano molto prima, quindi costa meno delle
+    100 partite fisse per punto. Ogni dimezzamento della larghezza costa circa 4
+    volte le partite. È un generatore: produce
+    un aggiornamento per ogni batch completato, così le curve parziali si possono
+    disegnare mentre lo sweep è ancora in corso.
+    """
+    points = {}
+    for rows, cols in sizes:
+        for pct in percentages:
+            mines = int((pct / 100) * rows * cols)
+            if mines >= rows * cols:
+                continue
+            points[(rows, cols, pct)] = {'mines': mines, 'wins': 0, 'games': 0, 'batches': 0, 'done': False}
+
+    index = {key: i for i, key in enumerate(points)}
+
+    def next_batch(key):
+        p = points[key]
+        p['batches'] += 1
+        # Seed diverso per ogni batch di ogni punto: lo sweep è riproducibile
+        return (key[0], key[1], p['mines'], batch, seed + index[key] * 1_000_003 + p['batches'])
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = {pool.submit(play_batch, *next_batch(key)): key for key in points}
+        while pending:
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                key = pending.pop(future)
+                p = points[key]
+                p['wins'] += future.result()
+                p['games'] += batch
+                low, high = wilson_interval(p['wins'], p['games'])
+                if p['games'] >= max_games or (p['games'] >= min_games and high - low <= target_width):
+                    p['done'] = True
+                else:
+                    pending[pool.submit(play_batch, *next_batch(key))] = key
+                rows, cols, pct = key
+                yield {'rows': rows, 'cols': cols, 'pct': pct, 'mines': p['mines'],
+                       'wins': p['wins'], 'games': p['games'],
+                       'win_rate': p['wins'] / p['games'], 'low': low, 'high': high,
+                       'done': p['done']}
+
+
+def curves(updates):
+    """Raccoglie gli aggiornamenti in curve {(rows, cols): {pct: ultimo aggiornamento}}."""
+    result = {}
+    for u in updates:
+        result.setdefault((u['rows'], u['cols']), {})[u['pct']] = u
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sweep adattivo della win rate al variare della densità di mine.")
+    parser.add_argument('--sizes', nargs='*', default=['16x16'], help="dimensioni RIGHExCOLONNE")
+    parser.add_argument('--step', type=int, default=1, help="passo in punti percentuali")
+    parser.add_argument('--target-width', type=float, default=0.2,
+                        help="larghezza massima dell'intervallo di Wilson al 95%%: 0.2 equivale a ~100 "
+                             "partite a win rate 0.5, 0.1 a ~400, 0.05 a ~1500")
+    parser.add_argument('--max-games', type=int, default=1000)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    sizes = [tuple(int(x) for x in s.split('x')) for s in args.sizes]
+    latest = {}
+    for u in sweep(sizes, range(0, 101, args.step), target_width=args.target_width,
+                   max_games=args.max_games, workers=args.workers):
+        latest[(u['rows'], u['cols'], u['pct'])] = u
+        if u['done']:
+            print(f"{u['rows']}x{u['cols']} {u['pct']:3d}%: {u['win_rate'] * 100:5.1f}% "
+                  f"[{u['low'] * 100:5.1f}, {u['high'] * 100:5.1f}] su {u['games']} partite")
+    print(f"Partite giocate: {sum(u['games'] for u in latest.values())}")
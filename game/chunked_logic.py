@@ -0,0 +1,368 @@
+import random
+from .game_logic import MOVE_REVEAL, Cell, MinesweeperLogic, copy_cell
+
+
+class _LazyRow:
+    """Vista su una riga della board: le chunk vengono allocate al primo accesso."""
+    def __init__(self, game, r):
+        self.game = game
+        self.r = r
+
+    def __getitem__(self, c):
+        if c < 0:
+            c += self.game.cols
+        cell = self.game.get_cell(self.r, c)
+        if cell is None:
+            raise IndexError(c)
+        return cell
+
+    def __len__(self):
+        return self.game.cols
+
+    def __iter__(self):
+        for c in range(self.game.cols):
+            yield self.game.get_cell(self.r, c)
+
+
+class _LazyBoard:
+    def __init__(self, game):
+        self.game = game
+
+    def __getitem__(self, r):
+        if r < 0:
+            r += self.game.rows
+        if not 0 <= r < self.game.rows:
+            raise IndexError(r)
+        return _LazyRow(self.game, r)
+
+    def __len__(self):
+        return self.game.rows
+
+    def __iter__(self):
+        for r in range(self.game.rows):
+            yield _LazyRow(self.game, r)
+
+
+class _LazyCells:
+    """Vista piatta (indice r * cols + c) delle celle, come MinesweeperLogic.cells."""
+    def __init__(self, game):
+        self.game = game
+
+    def __getitem__(self, i):
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return self.game.get_cell(*divmod(i, self.game.cols))
+
+    def __len__(self):
+        return self.game.rows * self.game.cols
+
+    def __iter__(self):
+        for r in range(self.game.rows):
+            for c in range(self.game.cols):
+                yield self.game.get_cell(r, c)
+
+
+class _LazyNeighbors:
+    """Come la tabella di game/neighbors.py, ma calcolata a ogni accesso."""
+    def __init__(self, game):
+        self.game = game
+
+    def __getitem__(self, i):
+        cols = self.game.cols
+        r, c = divmod(i, cols)
+        return tuple(nr * cols + nc for nr, nc in self.game.get_neighbors(r, c))
+
+    def __len__(self):
+        return self.game.rows * self.game.cols
+
+
+class ChunkedMinesweeperLogic(MinesweeperLogic):
+    """Variante di MinesweeperLogic per griglie molto grandi.
+
+    La board è divisa in chunk quadrate allocate solo al primo accesso. Il numero
+    di mine di ogni chunk si ottiene scendendo un albero binario di estrazioni
+    ipergeometriche con seme deterministico, quindi il totale è esatto e il layout
+    è coerente tra chunk vicine senza mai generare l'intera griglia. La memoria
+    cresce con l'area esplorata (più un bordo di una chunk), non con rows*cols.
+    I solver scorrono la board con known_cells(), che visita solo le chunk
+    allocate, quindi anche il loro costo per mossa segue l'area esplorata.
+
+    snapshot()/rollback() e clone() funzionano come nella classe base (clone()
+    copia solo le chunk allocate). set_hypothetical_mines() invece non è
+    supportato (solleva NotImplementedError): i layout ipotetici campionati
+    coprono tutte le celle nascoste, quindi la ricerca in avanti di
+    ai/lookahead.py non si applica.
+    """
+
+    def __init__(self, rows=1000, cols=1000, mines=150000, chunk_size=32, seed=None):
+        self.rows = rows
+        self.cols = cols
+        self.mines = mines
+        self.chunk_size = chunk_size
+        self.seed = seed if seed is not None else random.getrandbits(64)
+        self.chunk_rows = (rows + chunk_size - 1) // chunk_size
+        self.chunk_cols = (cols + chunk_size - 1) // chunk_size
+        self.n_chunks = self.chunk_rows * self.chunk_cols
+
+        self.board = _LazyBoard(self)
+        # Stessa interfaccia piatta di MinesweeperLogic, senza tabelle grandi quanto la griglia
+        self.cells = _LazyCells(self)
+        self.neighbors = _LazyNeighbors(self)
+        self.game_over = False
+        self.victory = False
+        self.first_click = True
+        self.revealed_count = 0
+        self.flag_count = 0
+        self.change_log = []
+        self.log_epoch = 0
+        self._layouts = []
+        self.moves = []
+
+        self.safe_cells = set()
+        self._chunks = {}        # chunk id -> lista piatta di Cell
+        self._chunk_mines = {}   # chunk id -> set di (r, c)
+        self._split_cache = {}   # (lo, hi) -> mine nell'intervallo di chunk
+
+    # --- Geometria delle chunk ---
+
+    def _chunk_id(self, r, c):
+        return (r // self.chunk_size) * self.chunk_cols + (c // self.chunk_size)
+
+    def _chunk_bounds(self, cid):
+        cr, cc = divmod(cid, self.chunk_cols)
+        r0, c0 = cr * self.chunk_size, cc * self.chunk_size
+        return r0, c0, min(self.rows, r0 + self.chunk_size), min(self.cols, c0 + self.chunk_size)
+
+    def _capacity(self, lo, hi):
+        """Celle disponibili per le mine nelle chunk [lo, hi)."""
+        total = 0
+        for cid in range(lo, hi):
+            r0, c0, r1, c1 = self._chunk_bounds(cid)
+            total += (r1 - r0) * (c1 - c0)
+        for r, c in self.safe_cells:
+            if lo <= self._chunk_id(r, c) < hi:
+                total -= 1
+        return total
+
+    def _mines_in_range(self, lo, hi):
+        """Mine nelle chunk [lo, hi), scendendo l'albero di split dalla radice."""
+        key = (lo, hi)
+        if key in self._split_cache:
+            return self._split_cache[key]
+        if lo == 0 and hi == self.n_chunks:
+            count = self.mines
+        else:
+            # Risale al nodo padre che contiene l'intervallo
+            plo, phi = 0, self.n_chunks
+            while True:
+                mid = (plo + phi) // 2
+                if hi <= mid:
+                    if (plo, mid) == key: break
+                    phi = mid
+                else:
+                    if (mid, phi) == key: break
+                    plo = mid
+            self._split(plo, phi)
+            count = self._split_cache[key]
+        self._split_cache[key] = count
+        return count
+
+    def _split(self, lo, hi):
+        """Divide le mine del nodo [lo, hi) tra i due figli (estrazione ipergeometrica)."""
+        mid = (lo + hi) // 2
+        if (lo, mid) in self._split_cache:
+            return
+        total = self._mines_in_range(lo, hi)
+        left_free = self._capacity(lo, mid)
+        right_free = self._capacity(mid, hi)
+        rng = random.Random(f"{self.seed}:{lo}:{hi}")
+        n = left_free + right_free
+        if total <= 1000:
+            # Estrazione esatta, una mina alla volta
+            left = 0
+            for _ in range(total):
+                if rng.random() * (left_free + right_free) < left_free:
+                    left += 1
+                    left_free -= 1
+                else:
+                    right_free -= 1
+        else:
+            # Approssimazione normale dell'ipergeometrica (i nodi alti hanno milioni di mine)
+            p = left_free / n
+            mean = total * p
+            var = total * p * (1 - p) * (n - total) / max(1, n - 1)
+            left = round(rng.gauss(mean, var ** 0.5))
+            left = max(total - right_free, min(left_free, total, left), 0)
+        self._split_cache[(lo, mid)] = left
+        self._split_cache[(mid, hi)] = total - left
+
+    def _mines_of_chunk(self, cid):
+        mines = self._chunk_mines.get(cid)
+        if mines is None:
+            count = self._mines_in_range(cid, cid + 1)
+            r0, c0, r1, c1 = self._chunk_bounds(cid)
+            spots = [(r, c) for r in range(r0, r1) for c in range(c0, c1)
+                     if (r, c) not in self.safe_cells]
+            rng = random.Random(f"{self.seed}:chunk:{cid}")
+            mines = set(rng.sample(spots, count))
+            self._chunk_mines[cid] = mines
+        return mines
+
+    def _has_mine(self, r, c):
+        return (r, c) in self._mines_of_chunk(self._chunk_id(r, c))
+
+    def _fill_chunk(self, cid):
+        """Calcola mine e numeri delle celle di una chunk già allocata."""
+        mines = self._mines_of_chunk(cid)
+        r0, c0, r1, c1 = self._chunk_bounds(cid)
+        for cell in self._chunks[cid]:
+            cell.is_mine = (cell.r, cell.c) in mines
+            if cell.is_mine:
+                continue
+            count = 0
+            for nr, nc in self.get_neighbors(cell.r, cell.c):
+                if r0 <= nr < r1 and c0 <= nc < c1:
+                    count += (nr, nc) in mines
+                else:
+                    count += self._has_mine(nr, nc)
+            cell.adjacent_mines = count
+
+    # --- Interfaccia di MinesweeperLogic ---
+
+    @property
+    def mine_positions(self):
+        """Mine delle chunk già generate (il resto della griglia non esiste ancora)."""
+        result = set()
+        for mines in self._chunk_mines.values():
+            result |= mines
+        return result
+
+    def get_cell(self, r, c):
+        if not (0 <= r < self.rows and 0 <= c < self.cols):
+            return None
+        cid = self._chunk_id(r, c)
+        cells = self._chunks.get(cid)
+        if cells is None:
+            r0, c0, r1, c1 = self._chunk_bounds(cid)
+            cells = [Cell(cr, cc) for cr in range(r0, r1) for cc in range(c0, c1)]
+            self._chunks[cid] = cells
+            if not self.first_click:
+                self._fill_chunk(cid)
+        r0, c0, _, c1 = self._chunk_bounds(cid)
+        return cells[(r - r0) * (c1 - c0) + (c - c0)]
+
+    def get_neighbors(self, r, c):
+        # Niente tabelle condivise: su griglie così grandi occuperebbero più della board
+        # (anche self.neighbors passa da qui)
+        neighbors = []
+        for i in range(max(0, r - 1), min(self.rows, r + 2)):
+            for j in range(max(0, c - 1), min(self.cols, c + 2)):
+                if i != r or j != c:
+                    neighbors.append((i, j))
+        return neighbors
+
+    def known_cells(self):
+        cols = self.cols
+        # Copia delle chunk: chi scorre può allocare le chunk di bordo
+        for cells in list(self._chunks.values()):
+            for cell in cells:
+                yield cell.r * cols + cell.c, cell
+
+    def random_hidden_cell(self, exclude=()):
+        # Quasi tutta la griglia è nascosta: estrazione con rifiuto, senza elencare
+        # le celle. Una chunk non allocata non ha celle rivelate né bandiere.
+        for _ in range(1000):
+            r, c = random.randrange(self.rows), random.randrange(self.cols)
+            if (r, c) in exclude:
+                continue
+            cells = self._chunks.get(self._chunk_id(r, c))
+            if cells is None:
+                return r, c
+            cell = self.get_cell(r, c)
+            if not cell.is_revealed and not cell.is_flagged:
+                return r, c
+        return super().random_hidden_cell(exclude)
+
+    def place_mines(self, safe_r, safe_c):
+        """Fissa la zona sicura del primo click; le mine vengono generate chunk per chunk."""
+        self.safe_cells = set()
+        for r in range(max(0, safe_r - 1), min(self.rows, safe_r + 2)):
+            for c in range(max(0, safe_c - 1), min(self.cols, safe_c + 2)):
+                self.safe_cells.add((r, c))
+
+        # Evita loop infinito se troppe mine
+        available_spots = (self.rows * self.cols) - len(self.safe_cells)
+        if self.mines > available_spots:
+            self.safe_cells = {(safe_r, safe_c)}
+
+        self._chunk_mines = {}
+        self._split_cache = {}
+        # Le chunk allocate prima del primo click (es. bandiere) vanno ricalcolate
+        for cid in self._chunks:
+            self._fill_chunk(cid)
+
+    def _unplace_mines(self):
+        self.safe_cells = set()
+        self._chunk_mines = {}
+        self._split_cache = {}
+        for cells in self._chunks.values():
+            for cell in cells:
+                cell.is_mine = False
+                cell.adjacent_mines = 0
+
+    def clone(self):
+        """Copia indipendente: si copiano solo le chunk allocate, quindi costa
+        quanto l'area esplorata."""
+        other = ChunkedMinesweeperLogic.__new__(ChunkedMinesweeperLogic)
+        other.__dict__.update(self.__dict__)
+        other.board = _LazyBoard(other)
+        other.cells = _LazyCells(other)
+        other.neighbors = _LazyNeighbors(other)
+        other._chunks = {cid: [copy_cell(cell) for cell in cells] for cid, cells in self._chunks.items()}
+        # I set di mine delle chunk non vengono più modificati dopo la creazione
+        other._chunk_mines = dict(self._chunk_mines)
+        other._split_cache = dict(self._split_cache)
+        other.safe_cells = set(self.safe_cells)
+        other.change_log = list(self.change_log)
+        other.moves = list(self.moves)
+        other._layouts = []
+        return other
+
+    def set_hypothetical_mines(self, mines):
+        raise NotImplementedError("ChunkedMinesweeperLogic non supporta layout ipotetici")
+
+    def reveal(self, r, c):
+        """Come MinesweeperLogic.reveal, ma con flood fill iterativo (niente ricorsione)."""
+        cell = self.get_cell(r, c)
+        if not cell or self.game_over or cell.is_revealed or cell.is_flagged:
+            return False
+
+        self._record_move(MOVE_REVEAL, r, c)
+        if self.first_click:
+            self.first_click = False
+            self.place_mines(r, c)
+
+        stack = [cell]
+        while stack:
+            cell = stack.pop()
+            if cell.is_revealed or cell.is_flagged:
+                continue
+            cell.is_revealed = True
+            self.revealed_count += 1
+            self.change_log.append((cell.r, cell.c))
+
+            if cell.is_mine:
+                self.game_over = True
+                self.victory = False
+                return True
+
+            if self.revealed_count == (self.rows * self.cols) - self.mines:
+                self.game_over = True
+                self.victory = True
+                return True
+
+            if cell.adjacent_mines == 0:
+                for nr, nc in self.get_neighbors(cell.r, cell.c):
+                    stack.append(self.get_cell(nr, nc))
+
+        return True
@@ -1,6 +1,15 @@
 import random
+from .neighbors import neighbor_table
+from .no_guess import generate_no_guess_mines
+
+# Tipi di mossa registrati in MinesweeperLogic.moves (bit basso dell'intero)
+MOVE_REVEAL = 0
+MOVE_FLAG = 1
 
 class Cell:
+    # Niente __dict__ per istanza: una griglia 30x30 ha 900 celle per partita
+    __slots__ = ('r', 'c', 'is_mine', 'is_revealed', 'is_flagged', 'adjacent_mines')
+
     def __init__(self, r, c):
         self.r = r
         self.c = c
@@ -9,18 +18,49 @@ class Cell:
         self.is_flagged = False
         self.adjacent_mines = 0
 
+def copy_cell(cell):
+    """Copia di una Cell (senza deepcopy: i campi sono tutti immutabili)."""
+    copy = Cell.__new__(Cell)
+    copy.r = cell.r
+    copy.c = cell.c
+    copy.is_mine = cell.is_mine
+    copy.is_revealed = cell.is_revealed
+    copy.is_flagged = cell.is_flagged
+    copy.adjacent_mines = cell.adjacent_mines
+    return copy
+
+
 class MinesweeperLogic:
-    def __init__(self, rows=30, cols=30, mines=150):
+    def __init__(self, rows=30, cols=30, mines=150, no_guess=False, seed=None):
         self.rows = rows
         self.cols = cols
         self.mines = mines
-        self.board = [[Cell(r, c) for c in range(cols)] for r in range(rows)]
+        # Il layout dipende solo da seed e primo click: senza seed esplicito ne
+        # viene estratto uno dal random globale, così random.seed() resta valido
+        self.seed = seed if seed is not None else random.getrandbits(64)
+        # Se True il primo click genera una griglia risolvibile senza guess
+        self.no_guess = no_guess
+        self.no_guess_verified = False
+        # Celle in ordine piatto (indice r * cols + c); board ne è la vista per righe
+        self.cells = [Cell(r, c) for r in range(rows) for c in range(cols)]
+        self.board = [self.cells[r * cols:(r + 1) * cols] for r in range(rows)]
+        # Tabelle dei vicini condivise da tutte le partite di questa dimensione
+        self.neighbors = neighbor_table(rows, cols)
         self.mine_positions = set()
         self.game_over = False
         self.victory = False
         self.first_click = True
         self.revealed_count = 0
         self.flag_count = 0
+        # Celle il cui stato (rivelata/bandiera) è cambiato, in ordine: le cache dei solver
+        # lo leggono e rollback() lo usa come journal delle mosse
+        self.change_log = []
+        # Incrementato a ogni rollback: chi legge change_log deve ripartire da zero
+        self.log_epoch = 0
+        self._layouts = []
+        # Mosse del giocatore, codificate come (r * cols + c) << 1 | tipo: con il
+        # seed bastano a rigiocare la partita (vedi game/replay.py)
+        self.moves = []
 
     def get_cell(self, r, c):
         if 0 <= r < self.rows and 0 <= c < self.cols:
@@ -28,44 +68,75 @@ class MinesweeperLogic:
         return None
 
     def get_neighbors(self, r, c):
-        neighbors = []
-        for i in range(max(0, r - 1), min(self.rows, r + 2)):
-            for j in range(max(0, c - 1), min(self.cols, c + 2)):
-                if i != r or j != c:
-                    neighbors.append((i, j))
-        return neighbors
+        cols = self.cols
+        return [divmod(j, cols) for j in self.neighbors[r * cols + c]]
+
+    def known_cells(self):
+        """Coppie (indice piatto, cella) delle celle presenti in memoria: qui tutte.
+
+        Le scansioni di frontiera dei solver passano da qui, così su una board a
+        chunk (game/chunked_logic.py) visitano solo l'area esplorata."""
+        return enumerate(self.cells)
+
+    def random_hidden_cell(self, exclude=()):
+        """Cella nascosta e senza bandiera fuori da exclude, scelta con il random
+        globale; None se non ce ne sono."""
+        hidden = [(cell.r, cell.c) for cell in self.cells
+                  if not cell.is_revealed and not cell.is_flagged and (cell.r, cell.c) not in exclude]
+        return random.choice(hidden) if hidden else None
 
     def place_mines(self, safe_r, safe_c):
         """Piazza le mine garantendo che safe_r, safe_c e vicini siano liberi."""
-        safe_cells = set()
-        for r in range(max(0, safe_r - 1), min(self.rows, safe_r + 2)):
-            for c in range(max(0, safe_c - 1), min(self.cols, safe_c + 2)):
-                safe_cells.add((r, c))
+        if self.no_guess:
+            positions, self.no_guess_verified = generate_no_guess_mines(
+                self.rows, self.cols, self.mines, safe_r, safe_c, rng=random.Random(self.seed))
+            for r, c in positions:
+                self.mine_positions.add((r, c))
+                self.board[r][c].is_mine = True
+            self._compute_numbers()
+            return
+
+        start = safe_r * self.cols + safe_c
+        safe_cells = {start, *self.neighbors[start]}
 
         # Evita loop infinito se troppe mine
         available_spots = (self.rows * self.cols) - len(safe_cells)
         if self.mines > available_spots:
-            safe_cells = {(safe_r, safe_c)}
+            safe_cells = {start}
 
+        rng = random.Random(self.seed)
+        cells = self.cells
         while len(self.mine_positions) < self.mines:
-            r = random.randint(0, self.rows - 1)
-            c = random.randint(0, self.cols - 1)
-            if (r, c) not in safe_cells and (r, c) not in self.mine_positions:
+            r = rng.randint(0, self.rows - 1)
+            c = rng.randint(0, self.cols - 1)
+            i = r * self.cols + c
+            if i not in safe_cells and not cells[i].is_mine:
                 self.mine_positions.add((r, c))
-                self.board[r][c].is_mine = True
+                cells[i].is_mine = True
+
+        self._compute_numbers()
 
-        # Calcola i numeri per le celle adiacenti
-        for r in range(self.rows):
-            for c in range(self.cols):
-                if not self.board[r][c].is_mine:
-                    count = 0
-                    for nr, nc in self.get_neighbors(r, c):
-                        if (nr, nc) in self.mine_positions:
-                            count += 1
-                    self.board[r][c].adjacent_mines = count
+    def _compute_numbers(self):
+        # Calcola i numeri per le celle adiacenti, partendo dalle mine
+        counts = [0] * len(self.cells)
+        for r, c in self.mine_positions:
+            for j in self.neighbors[r * self.cols + c]:
+                counts[j] += 1
+        for cell, count in zip(self.cells, counts):
+            if not cell.is_mine:
+                cell.adjacent_mines = count
+
+    def _record_move(self, kind, r, c):
+        self.moves.append((r * self.cols + c) << 1 | kind)
 
     def reveal(self, r, c):
         """Ritorna True se la mossa è valida (o ha causato game over), False se ignorata."""
+        valid = self._reveal(r, c)
+        if valid:
+            self._record_move(MOVE_REVEAL, r, c)
+        return valid
+
+    def _reveal(self, r, c):
         cell = self.get_cell(r, c)
         if not cell or self.game_over or cell.is_revealed or cell.is_flagged:
             return False
@@ -76,6 +147,7 @@ class MinesweeperLogic:
 
         cell.is_revealed = True
         self.revealed_count += 1
+        self.change_log.append((r, c))
 
         if cell.is_mine:
             self.game_over = True
@@ -90,14 +162,166 @@ class MinesweeperLogic:
         if cell.adjacent_mines == 0:
             # Flood fill automatico per gli zeri
             for nr, nc in self.get_neighbors(r, c):
-                self.reveal(nr, nc)
+                self._reveal(nr, nc)
         
         return True
 
+    def reveal_many(self, cells):
+        """Rivela in blocco un insieme di celle con un unico flood fill iterativo.
+        Ritorna il numero di celle effettivamente rivelate."""
+        before = self.revealed_count
+        pending = list(cells)
+        while pending and not self.game_over:
+            r, c = pending.pop()
+            cell = self.get_cell(r, c)
+            if not cell or cell.is_revealed or cell.is_flagged:
+                continue
+            # Si registrano solo le celle richieste, non quelle aperte dal flood fill
+            self._record_move(MOVE_REVEAL, r, c)
+
+            if self.first_click:
+                self.place_mines(r, c)
+                self.first_click = False
+
+            stack = [(r, c)]
+            while stack and not self.game_over:
+                r, c = stack.pop()
+                cell = self.get_cell(r, c)
+                if cell.is_revealed or cell.is_flagged:
+                    continue
+
+                cell.is_revealed = True
+                self.revealed_count += 1
+                self.change_log.append((r, c))
+
+                if cell.is_mine:
+                    self.game_over = True
+                    self.victory = False
+                elif self.revealed_count == (self.rows * self.cols) - self.mines:
+                    self.game_over = True
+                    self.victory = True
+                elif cell.adjacent_mines == 0:
+                    stack.extend(self.get_neighbors(r, c))
+        return self.revealed_count - before
+
+    def flag_many(self, cells):
+        """Piazza una bandiera su ogni cella nascosta non ancora segnata. Ritorna quante ne ha piazzate."""
+        if self.game_over:
+            return 0
+        placed = 0
+        for r, c in cells:
+            cell = self.get_cell(r, c)
+            if cell and not cell.is_revealed and not cell.is_flagged:
+                cell.is_flagged = True
+                self.change_log.append((r, c))
+                self._record_move(MOVE_FLAG, r, c)
+                placed += 1
+        self.flag_count += placed
+        return placed
+
     def toggle_flag(self, r, c):
         cell = self.get_cell(r, c)
         if not cell or self.game_over or cell.is_revealed:
             return
         
         cell.is_flagged = not cell.is_flagged
-        self.flag_count += (1 if cell.is_flagged else -1)
\ No newline at end of file
+        self.flag_count += (1 if cell.is_flagged else -1)
+        self.change_log.append((r, c))
+        self._record_move(MOVE_FLAG, r, c)
+
+    # --- Snapshot e undo (per la ricerca in avanti) ---
+
+    def snapshot(self):
+        """Ritorna un token per tornare allo stato attuale con rollback(). Costa O(1)."""
+        return (len(self.change_log), len(self.moves), len(self._layouts), self.game_over, self.victory,
+                self.first_click, self.revealed_count, self.flag_count)
+
+    def rollback(self, token):
+        """Annulla tutte le mosse (e i layout ipotetici) successivi allo snapshot.
+        Costa quanto le celle cambiate nel frattempo, non quanto la griglia."""
+        n_log, n_moves, n_layouts, game_over, victory, first_click, revealed_count, flag_count = token
+        log = self.change_log
+        # Una cella rivelata non può più cambiare, quindi se ora è rivelata la voce
+        # era una reveal; altrimenti era un cambio di bandiera
+        for i in range(len(log) - 1, n_log - 1, -1):
+            r, c = log[i]
+            cell = self.board[r][c]
+            if cell.is_revealed:
+                cell.is_revealed = False
+            else:
+                cell.is_flagged = not cell.is_flagged
+        del log[n_log:]
+        del self.moves[n_moves:]
+
+        while len(self._layouts) > n_layouts:
+            positions, mine_changes, count_changes = self._layouts.pop()
+            for cell, value in mine_changes:
+                cell.is_mine = value
+            for cell, value in count_changes:
+                cell.adjacent_mines = value
+            self.mine_positions = positions
+
+        if first_click and not self.first_click:
+            self._unplace_mines()
+
+        self.game_over = game_over
+        self.victory = victory
+        self.first_click = first_click
+        self.revealed_count = revealed_count
+        self.flag_count = flag_count
+        self.log_epoch += 1
+
+    def _unplace_mines(self):
+        for cell in self.cells:
+            cell.is_mine = False
+            cell.adjacent_mines = 0
+        self.mine_positions = set()
+
+    def set_hypothetical_mines(self, mines):
+        """Sostituisce il layout delle celle nascoste con mines, annullabile con rollback().
+
+        Il layout deve essere coerente con i numeri già rivelati (per esempio un
+        campione di MonteCarloEstimator): si aggiornano solo le celle che cambiano.
+        """
+        mines = set(mines)
+        mine_changes = []
+        for r, c in self.mine_positions ^ mines:
+            cell = self.board[r][c]
+            mine_changes.append((cell, cell.is_mine))
+            cell.is_mine = (r, c) in mines
+
+        count_changes = []
+        touched = set()
+        cells, nbrs, cols = self.cells, self.neighbors, self.cols
+        for cell, _ in mine_changes:
+            # Si ricontano la cella cambiata (una mina diventata libera ha ancora 0)
+            # e i suoi vicini; come in _compute_numbers le mine restano a 0
+            i = cell.r * cols + cell.c
+            for j in (i,) + nbrs[i]:
+                if j in touched:
+                    continue
+                touched.add(j)
+                other = cells[j]
+                count = 0
+                if not other.is_mine:
+                    for k in nbrs[j]:
+                        if cells[k].is_mine: count += 1
+                if count != other.adjacent_mines:
+                    count_changes.append((other, other.adjacent_mines))
+                    other.adjacent_mines = count
+
+        self._layouts.append((self.mine_positions, mine_changes, count_changes))
+        self.mine_positions = mines
+
+    def clone(self):
+        """Copia indipendente della partita, senza deepcopy (una Cell nuova per cella)."""
+        other = MinesweeperLogic.__new__(MinesweeperLogic)
+        other.__dict__.update(self.__dict__)
+        cells = [copy_cell(cell) for cell in self.cells]
+        other.cells = cells
+        other.board = [cells[r * self.cols:(r + 1) * self.cols] for r in range(self.rows)]
+        other.mine_positions = set(self.mine_positions)
+        other.change_log = list(self.change_log)
+        other.moves = list(self.moves)
+        other._layouts = []
+        return other
@@ -0,0 +1,29 @@
+# Tabelle dei vicini per dimensione di griglia, costruite una volta per processo
+# e condivise da tutte le partite della stessa dimensione (da non modificare).
+# Se ne tengono al più MAX_TABLES: una partita che usa una tabella scartata
+# continua a tenerla viva finché esiste.
+MAX_TABLES = 4
+_TABLES = {}
+
+
+def neighbor_table(rows, cols):
+    """Per ogni indice piatto r * cols + c, la tupla degli indici piatti dei vicini
+    (in ordine di riga, come get_neighbors)."""
+    key = (rows, cols)
+    table = _TABLES.get(key)
+    if table is None:
+        # Gli interi sono condivisi tra le tuple invece di crearne uno per voce
+        index = list(range(rows * cols))
+        table = []
+        for r in range(rows):
+            r0, r1 = max(0, r - 1), min(rows, r + 2)
+            for c in range(cols):
+                c0, c1 = max(0, c - 1), min(cols, c + 2)
+                table.append(tuple(index[i * cols + j]
+                                   for i in range(r0, r1)
+                                   for j in range(c0, c1)
+                                   if i != r or j != c))
+        if len(_TABLES) >= MAX_TABLES:
+            del _TABLES[next(iter(_TABLES))]
+        _TABLES[key] = table
+    return table
@@ -0,0 +1,198 @@
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .neighbors import neighbor_table
+
+# Oltre questa densità di mine una griglia risolvibile senza guess è rara e la
+# ricerca esaurirebbe comunque il budget: si rinuncia subito (layout casuale,
+# non verificato). Sul 16x30 il 25% si genera in qualche decimo di secondo, al
+# 35% non riesce nemmeno dopo decine di secondi.
+MAX_DENSITY = 0.3
+
+
+def _safe_zone(rows, cols, mines, safe_r, safe_c):
+    """Stessa zona sicura di MinesweeperLogic.place_mines."""
+    zone = {r * cols + c
+            for r in range(max(0, safe_r - 1), min(rows, safe_r + 2))
+            for c in range(max(0, safe_c - 1), min(cols, safe_c + 2))}
+    if mines > rows * cols - len(zone):
+        zone = {safe_r * cols + safe_c}
+    return zone
+
+
+def solve_without_guessing(rows, cols, mine_set, start):
+    """Risolve la griglia con sole deduzioni a partire da start (indice piatto).
+
+    Usa regola base, regola dei sottoinsiemi e il conteggio globale (mine finite).
+    Ritorna (risolta, celle di frontiera rimaste ignote).
+    """
+    nbrs = neighbor_table(rows, cols)
+    n = rows * cols
+    counts = [0] * n
+    for m in mine_set:
+        for j in nbrs[m]:
+            counts[j] += 1
+
+    revealed = [False] * n
+    known_mine = [False] * n
+    n_revealed = 0
+    n_known = 0
+    target = n - len(mine_set)
+
+    def reveal(i):
+        nonlocal n_revealed
+        stack = [i]
+        while stack:
+            k = stack.pop()
+            if revealed[k] or known_mine[k]:
+                continue
+            revealed[k] = True
+            n_revealed += 1
+            if counts[k] == 0:
+                stack.extend(nbrs[k])
+
+    reveal(start)
+    while n_revealed < target:
+        # Vincoli attivi: (celle ignote, mine rimanenti)
+        constraints = []
+        progress = False
+        for i in range(n):
+            if not revealed[i] or counts[i] == 0:
+                continue
+            unknown = []
+            flags = 0
+            for j in nbrs[i]:
+                if known_mine[j]: flags += 1
+                elif not revealed[j]: unknown.append(j)
+            if not unknown:
+                continue
+            rem = counts[i] - flags
+            if rem == 0:
+                for j in unknown: reveal(j)
+                progress = True
+            elif rem == len(unknown):
+                for j in unknown:
+                    if not known_mine[j]:
+                        known_mine[j] = True
+                        n_known += 1
+                progress = True
+            else:
+                constraints.append((frozenset(unknown), rem))
+        if progress:
+            continue
+
+        # Regola dei sottoinsiemi tra vincoli che condividono celle
+        by_cell = {}
+        for idx, (cells, _) in enumerate(constraints):
+            for j in cells:
+                by_cell.setdefault(j, []).append(idx)
+        for a, (cells_a, rem_a) in enumerate(constraints):
+            others = {b for j in cells_a for b in by_cell[j] if b != a}
+            for b in others:
+                cells_b, rem_b = constraints[b]
+                if cells_a < cells_b:
+                    diff = cells_b - cells_a
+                    if rem_b == rem_a:
+                        for j in diff: reveal(j)
+                        progress = True
+                    elif rem_b - rem_a == len(diff):
+                        for j in diff:
+                            if not known_mine[j]:
+                                known_mine[j] = True
+                                n_known += 1
+                        progress = True
+            if progress:
+                break
+        if progress:
+            continue
+
+        # Conteggio globale: se le mine sono già tutte note, le ignote sono sicure
+        unknown_all = [i for i in range(n) if not revealed[i] and not known_mine[i]]
+        mines_left = len(mine_set) - n_known
+        if mines_left == 0:
+            for j in unknown_all: reveal(j)
+            continue
+
+        # Senza vincoli (zona chiusa da mine note) si blocca su tutte le ignote
+        frontier = {j for cells, _ in constraints for j in cells} or set(unknown_all)
+        return False, frontier
+    return True, set()
+
+
+def generate_no_guess_mines(rows, cols, mines, safe_r, safe_c, rng=None,
+                            max_relocations=2000, max_restarts=20, max_solves=1000,
+                            time_limit=2.0):
+    """Genera un layout risolvibile senza guess dal primo click in (safe_r, safe_c).
+
+    Parte da un layout casuale e, quando il solver si blocca, sposta una mina
+    sulla frontiera bloccata (o ne porta una lì) invece di rigenerare tutto.
+    max_solves limita le risoluzioni complessive (circa 1-2 ms l'una sul 16x30,
+    di più su griglie grandi) e time_limit i secondi, così il primo click non
+    blocca GUI o server; sopra MAX_DENSITY non si prova nemmeno. Il layout
+    dipende solo da rng, tranne quando scatta time_limit (None lo disattiva).
+    Ritorna (set di (r, c), verificato): se non ci riesce entro i limiti il
+    layout restituito è l'ultimo provato, con verificato = False.
+    """
+    rng = rng or random
+    n = rows * cols
+    zone = _safe_zone(rows, cols, mines, safe_r, safe_c)
+    spots = [i for i in range(n) if i not in zone]
+    start = safe_r * cols + safe_c
+    nbrs = neighbor_table(rows, cols)
+
+    if mines > MAX_DENSITY * n:
+        mine_set = set(rng.sample(spots, min(mines, len(spots))))
+        return {divmod(i, cols) for i in mine_set}, False
+
+    deadline = time.perf_counter() + time_limit if time_limit is not None else None
+    solves = 0
+
+    def out_of_budget():
+        return solves >= max_solves or (deadline is not None and time.perf_counter() >= deadline)
+
+    mine_set = set()
+    for _ in range(max_restarts):
+        if out_of_budget():
+            break
+        mine_set = set(rng.sample(spots, min(mines, len(spots))))
+        for _ in range(max_relocations):
+            if out_of_budget():
+                break
+            solves += 1
+            solved, frontier = solve_without_guessing(rows, cols, mine_set, start)
+            if solved:
+                return {divmod(i, cols) for i in mine_set}, True
+            if not frontier:
+                break
+
+            # Rilocazione locale: una cella della frontiera bloccata cambia stato
+            near = frontier | {j for f in frontier for j in nbrs[f]}
+            f = rng.choice(sorted(frontier))
+            if f in mine_set:
+                far = [i for i in spots if i not in mine_set and i not in near]
+                target = rng.choice(far) if far else rng.choice([i for i in spots if i not in mine_set])
+                mine_set.discard(f)
+                mine_set.add(target)
+            else:
+                far = [i for i in mine_set if i not in near]
+                if not far:
+                    continue
+                mine_set.discard(rng.choice(far))
+                mine_set.add(f)
+    return {divmod(i, cols) for i in mine_set}, False
+
+
+def _generate_one(args):
+    rows, cols, mines, safe_r, safe_c, seed = args
+    # Generazione offline: solo il budget di risoluzioni, così il risultato dipende dal seed
+    return generate_no_guess_mines(rows, cols, mines, safe_r, safe_c, rng=random.Random(seed),
+                                   time_limit=None)
+
+
+def generate_batch(count, rows=16, cols=30, mines=99, start=None, workers=None, seed=0):
+    """Genera count layout senza guess in parallelo. Ritorna una lista di (mine, verificato)."""
+    safe_r, safe_c = start if start is not None else (rows // 2, cols // 2)
+    jobs = [(rows, cols, mines, safe_r, safe_c, seed + i) for i in range(count)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_generate_one, jobs, chunksize=max(1, count // 64)))
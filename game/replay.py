@@ -0,0 +1,167 @@
+import mmap
+import os
+import struct
+from collections import namedtuple
+
+from .game_logic import MOVE_FLAG, MinesweeperLogic
+
+# Formato del log binario (little endian):
+#
+#   intestazione file: b'FFRL' + versione (u32)
+#   per ogni partita:  seed (u64), rows (u16), cols (u16), mines (u32),
+#                      no_guess (u8), victory (u8), secondi (f32), numero di mosse (u32)
+#                      e poi una u32 per mossa: (r * cols + c) << 1 | tipo
+#
+# Una partita 16x30 con un centinaio di mosse occupa meno di mezzo KB.
+
+LOG_MAGIC = b'FFRL'
+LOG_VERSION = 1
+_FILE_HEADER = struct.Struct('<4sI')
+_GAME_HEADER = struct.Struct('<QHHIBBfI')
+_MOVE = struct.Struct('<I')
+
+GameRecord = namedtuple('GameRecord', 'seed rows cols mines no_guess victory elapsed moves')
+
+
+class ReplayWriter:
+    """Accoda partite a un log binario, scrivendole su disco a blocchi di batch_size."""
+
+    def __init__(self, path, batch_size=256):
+        self.path = path
+        self.batch_size = batch_size
+        self._buffer = bytearray()
+        self._pending = 0
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            with open(path, 'wb') as f:
+                f.write(_FILE_HEADER.pack(LOG_MAGIC, LOG_VERSION))
+
+    def add(self, game, elapsed=0.0):
+        """Registra seed, parametri e mosse di una partita (di solito già finita)."""
+        moves = game.moves
+        self._buffer += _GAME_HEADER.pack(game.seed, game.rows, game.cols, game.mines,
+                                          bool(getattr(game, 'no_guess', False)), game.victory,
+                                          elapsed, len(moves))
+        self._buffer += struct.pack(f'<{len(moves)}I', *moves)
+        self._pending += 1
+        if self._pending >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self._buffer:
+            with open(self.path, 'ab') as f:
+                f.write(self._buffer)
+            self._buffer = bytearray()
+            self._pending = 0
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ReplayReader:
+    """Legge un log binario tramite memory map: le mosse vengono decodificate
+    solo per le partite a cui si accede, quindi il file può superare la RAM."""
+
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # File vuoto: mmap non accetta lunghezza zero
+            self._file.close()
+            raise ValueError(f"{path}: log vuoto")
+        magic, version = _FILE_HEADER.unpack_from(self._map, 0)
+        if magic != LOG_MAGIC or version != LOG_VERSION:
+            self.close()
+            raise ValueError(f"{path}: formato di log non riconosciuto")
+
+        # Indice degli offset: si leggono solo le intestazioni, saltando le mosse
+        self._offsets = []
+        pos = _FILE_HEADER.size
+        size = len(self._map)
+        while pos + _GAME_HEADER.size <= size:
+            n_moves = _GAME_HEADER.unpack_from(self._map, pos)[-1]
+            end = pos + _GAME_HEADER.size + n_moves * _MOVE.size
+            if end > size:
+                break  # partita troncata (scrittura interrotta)
+            self._offsets.append(pos)
+            pos = end
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def __getitem__(self, i):
+        pos = self._offsets[i]
+        seed, rows, cols, mines, no_guess, victory, elapsed, n_moves = _GAME_HEADER.unpack_from(self._map, pos)
+        moves = struct.unpack_from(f'<{n_moves}I', self._map, pos + _GAME_HEADER.size)
+        return GameRecord(seed, rows, cols, mines, bool(no_guess), bool(victory), elapsed, moves)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def decode_move(move, cols):
+    """Ritorna (tipo, r, c) di una mossa codificata."""
+    r, c = divmod(move >> 1, cols)
+    return move & 1, r, c
+
+
+def new_game(record):
+    """Partita nuova con gli stessi parametri e lo stesso seed della registrazione."""
+    return MinesweeperLogic(record.rows, record.cols, record.mines,
+                            no_guess=record.no_guess, seed=record.seed)
+
+
+def replay(record):
+    """Rigioca esattamente le mosse registrate e ritorna la partita risultante."""
+    game = new_game(record)
+    for move in record.moves:
+        kind, r, c = decode_move(move, record.cols)
+        if kind == MOVE_FLAG:
+            game.toggle_flag(r, c)
+        else:
+            game.reveal(r, c)
+    return game
+
+
+def compare(record, game, elapsed=0.0):
+    """Confronta una registrazione con una nuova partita giocata sullo stesso seed.
+
+    Ritorna un dizionario con l'indice della prima mossa diversa (None se le
+    sequenze coincidono), gli esiti e i tempi delle due partite (elapsed è il
+    tempo della nuova).
+    """
+    old, new = record.moves, game.moves
+    divergence = None
+    for i in range(min(len(old), len(new))):
+        if old[i] != new[i]:
+            divergence = i
+            break
+    if divergence is None and len(old) != len(new):
+        divergence = min(len(old), len(new))
+    return {
+        'seed': record.seed,
+        'divergence': divergence,
+        'moves_old': len(old),
+        'moves_new': len(new),
+        'victory_old': record.victory,
+        'victory_new': game.victory,
+        'elapsed_old': record.elapsed,
+        'elapsed_new': elapsed,
+    }
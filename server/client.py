@@ -0,0 +1,76 @@
+import argparse
+import asyncio
+import itertools
+import json
+import time
+
+
+class GameClient:
+    """Client locale per il game server: una connessione, richieste in sequenza."""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self._ids = itertools.count(1)
+
+    @classmethod
+    async def connect(cls, host='127.0.0.1', port=8765, path=None):
+        if path:
+            reader, writer = await asyncio.open_unix_connection(path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def request(self, op, **params):
+        params['op'] = op
+        params['id'] = next(self._ids)
+        self.writer.write((json.dumps(params) + '\n').encode())
+        await self.writer.drain()
+        response = json.loads(await self.reader.readline())
+        if not response.get('ok'):
+            raise RuntimeError(response.get('error'))
+        return response
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+async def simulate_users(n_users, games_per_user, rows=16, cols=16, mines=40, solver='logic',
+                         host='127.0.0.1', port=8765, path=None):
+    """Simula n_users utenti concorrenti, ognuno con la propria connessione e le proprie partite."""
+    async def user():
+        client = await GameClient.connect(host, port, path)
+        wins = 0
+        try:
+            for _ in range(games_per_user):
+                sid = (await client.request('new', rows=rows, cols=cols, mines=mines, solver=solver))['session']
+                result = await client.request('play', session=sid)
+                wins += result['victory']
+                await client.request('close', session=sid)
+        finally:
+            await client.close()
+        return wins
+
+    t0 = time.perf_counter()
+    wins = sum(await asyncio.gather(*(user() for _ in range(n_users))))
+    elapsed = time.perf_counter() - t0
+
+    client = await GameClient.connect(host, port, path)
+    metrics = await client.request('metrics')
+    await client.close()
+    return {'games': n_users * games_per_user, 'wins': wins, 'elapsed_s': elapsed, 'server': metrics}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Client di carico per il game server.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', default=None)
+    parser.add_argument('--users', type=int, default=10)
+    parser.add_argument('--games', type=int, default=5, help="partite per utente")
+    parser.add_argument('--solver', default='logic', choices=['logic', 'ml', 'mlp'])
+    args = parser.parse_args()
+    result = asyncio.run(simulate_users(args.users, args.games, solver=args.solver,
+                                        host=args.host, port=args.port, path=args.unix))
+    print(json.dumps(result, indent=2))
@@ -0,0 +1,327 @@
+import argparse
+import asyncio
+import importlib
+import itertools
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from collections import defaultdict, deque
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game.game_logic import MinesweeperLogic
+
+# Solver disponibili: modulo importato solo alla prima sessione che lo usa
+SOLVER_MODULES = {
+    'logic': 'ai.solver',
+    'ml': 'ai.solver_ML',
+    'mlp': 'ai.solver_MLP',
+}
+
+
+class Session:
+    def __init__(self, sid, game, ai, kind):
+        self.id = sid
+        self.game = game
+        self.ai = ai
+        self.kind = kind
+        self.created = time.perf_counter()
+        # Una sola operazione alla volta per sessione (il solver può girare in un thread)
+        self.lock = asyncio.Lock()
+
+    def summary(self):
+        return {
+            'session': self.id,
+            'game_over': self.game.game_over,
+            'victory': self.game.victory,
+            'revealed': self.game.revealed_count,
+            'flags': self.game.flag_count,
+        }
+
+    def board(self):
+        """Board come lista di stringhe: '#' nascosta, 'F' bandiera, '*' mina, cifre altrimenti."""
+        rows = []
+        for row in self.game.board:
+            line = []
+            for cell in row:
+                if cell.is_flagged: line.append('F')
+                elif not cell.is_revealed: line.append('#')
+                elif cell.is_mine: line.append('*')
+                else: line.append(str(cell.adjacent_mines))
+            rows.append(''.join(line))
+        return rows
+
+
+class Metrics:
+    """Contatori e latenze per operazione (finestra mobile per i percentili)."""
+    def __init__(self, window=2000):
+        self.started = time.perf_counter()
+        self.counts = defaultdict(int)
+        self.latencies = defaultdict(lambda: deque(maxlen=window))
+        self.batch_sizes = deque(maxlen=window)
+        self.games_finished = 0
+
+    def record(self, op, seconds):
+        self.counts[op] += 1
+        self.latencies[op].append(seconds)
+
+    def snapshot(self):
+        uptime = time.perf_counter() - self.started
+        ops = {}
+        for op, lat in self.latencies.items():
+            ordered = sorted(lat)
+            ops[op] = {
+                'count': self.counts[op],
+                'p50_ms': statistics.median(ordered) * 1000,
+                'p95_ms': ordered[int(0.95 * (len(ordered) - 1))] * 1000,
+            }
+        total = sum(self.counts.values())
+        return {
+            'uptime_s': uptime,
+            'requests': total,
+            'requests_per_s': total / uptime if uptime > 0 else 0.0,
+            'games_finished': self.games_finished,
+            'games_per_s': self.games_finished / uptime if uptime > 0 else 0.0,
+            'mean_guess_batch': statistics.mean(self.batch_sizes) if self.batch_sizes else 0.0,
+            'ops': ops,
+        }
+
+
+class GameServer:
+    """Server asyncio che ospita molte partite e sessioni solver nello stesso processo.
+
+    Protocollo: una richiesta JSON per riga ({"op": ..., "id": ...}), una risposta
+    JSON per riga con lo stesso "id". I guess delle sessioni ML in attesa vengono
+    raccolti per batch_window secondi e valutati con una sola predict_proba per
+    modello.
+
+    Deduzioni e guess del solver logico girano in un thread dell'executor, così
+    il loop continua a servire gli altri client. Le sessioni ospitate non
+    scrivono dataset né modello su disco, a meno di passare dataset_file e
+    brain_file.
+    """
+
+    def __init__(self, batch_window=0.002, max_batch=256, dataset_file=None, brain_file=None,
+                 guess_sweeps=50):
+        self.sessions = {}
+        self.dataset_file = dataset_file
+        self.brain_file = brain_file
+        # Sweep Monte-Carlo per guess del solver logico (tempo per guess limitato)
+        self.guess_sweeps = guess_sweeps
+        self._ids = itertools.count(1)
+        self.metrics = Metrics()
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self._guess_queue = None
+        self._batcher = None
+
+    # --- Avvio ---
+
+    async def start(self, host='127.0.0.1', port=8765, path=None):
+        self._guess_queue = asyncio.Queue()
+        self._batcher = asyncio.create_task(self._batch_guesses())
+        if path:
+            return await asyncio.start_unix_server(self._handle_client, path=path)
+        return await asyncio.start_server(self._handle_client, host, port)
+
+    async def _handle_client(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                request = {}
+                try:
+                    request = json.loads(line)
+                    response = await self.dispatch(request)
+                except Exception as e:
+                    response = {'ok': False, 'error': f"{type(e).__name__}: {e}"}
+                response['id'] = request.get('id') if isinstance(request, dict) else None
+                writer.write((json.dumps(response) + '\n').encode())
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(self, request):
+        op = request.get('op')
+        handler = getattr(self, f"op_{op}", None)
+        if handler is None:
+            return {'ok': False, 'error': f"operazione sconosciuta: {op}"}
+        t0 = time.perf_counter()
+        session = self.sessions.get(request.get('session'))
+        if session is not None:
+            async with session.lock:
+                result = await handler(request)
+        else:
+            result = await handler(request)
+        self.metrics.record(op, time.perf_counter() - t0)
+        result.setdefault('ok', True)
+        return result
+
+    def _session(self, request):
+        sid = request.get('session')
+        if sid not in self.sessions:
+            raise KeyError(f"sessione {sid} inesistente")
+        return self.sessions[sid]
+
+    # --- Operazioni ---
+
+    async def op_new(self, request):
+        kind = request.get('solver', 'logic')
+        module = importlib.import_module(SOLVER_MODULES[kind])
+        game = MinesweeperLogic(request.get('rows', 16), request.get('cols', 16), request.get('mines', 40))
+        if kind == 'logic':
+            ai = module.MinesweeperAI(game, csv_filename=self.dataset_file)
+            ai.guess_max_sweeps = self.guess_sweeps
+        elif kind == 'mlp':
+            ai = module.MinesweeperAI(game, csv_filename=self.dataset_file, brain_file=self.brain_file)
+        else:
+            ai = module.MinesweeperAI(game, csv_filename=self.dataset_file)
+        sid = next(self._ids)
+        self.sessions[sid] = Session(sid, game, ai, kind)
+        return {'session': sid}
+
+    async def op_close(self, request):
+        session = self._session(request)
+        del self.sessions[session.id]
+        return {'session': session.id}
+
+    async def op_reveal(self, request):
+        session = self._session(request)
+        session.game.reveal(request['r'], request['c'])
+        return session.summary()
+
+    async def op_flag(self, request):
+        session = self._session(request)
+        session.game.toggle_flag(request['r'], request['c'])
+        return session.summary()
+
+    async def op_state(self, request):
+        session = self._session(request)
+        result = session.summary()
+        result['board'] = session.board()
+        return result
+
+    async def op_solve(self, request):
+        session = self._session(request)
+        summary = await self._run(session.ai.solve_until_guess)
+        result = session.summary()
+        # Sotto una chiave propria: 'revealed' resta il totale della partita
+        result['solve'] = summary
+        return result
+
+    async def op_guess(self, request):
+        session = self._session(request)
+        await self._guess(session)
+        return session.summary()
+
+    async def op_play(self, request):
+        """Gioca la partita fino alla fine (primo click al centro se serve)."""
+        session = self._session(request)
+        game = session.game
+        if game.first_click:
+            game.reveal(game.rows // 2, game.cols // 2)
+        steps = 0
+        while not game.game_over and steps < game.rows * game.cols * 2:
+            if (await self._run(session.ai.solve_until_guess))['needs_guess']:
+                await self._guess(session)
+            steps += 1
+        if hasattr(session.ai, 'learn_online') and session.ai.memory:
+            session.ai.learn_online()
+        self.metrics.games_finished += 1
+        return session.summary()
+
+    async def op_metrics(self, request):
+        result = self.metrics.snapshot()
+        result['sessions'] = len(self.sessions)
+        return result
+
+    # --- Lavoro del solver ---
+
+    async def _run(self, fn):
+        """Esegue lavoro CPU del solver nell'executor di default, fuori dal loop."""
+        return await asyncio.get_running_loop().run_in_executor(None, fn)
+
+    async def _guess(self, session):
+        if session.kind == 'logic':
+            await self._run(session.ai.make_guess)
+            return
+        future = asyncio.get_running_loop().create_future()
+        await self._guess_queue.put((session, future))
+        await future
+
+    async def _batch_guesses(self):
+        while True:
+            pending = [await self._guess_queue.get()]
+            deadline = time.perf_counter() + self.batch_window
+            while len(pending) < self.max_batch:
+                timeout = deadline - time.perf_counter()
+                if timeout <= 0:
+                    break
+                try:
+                    pending.append(await asyncio.wait_for(self._guess_queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            self.metrics.batch_sizes.append(len(pending))
+            try:
+                self._run_guess_batch(pending)
+            except Exception as e:
+                for _, future in pending:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def _run_guess_batch(self, pending):
+        """Una sola predict_proba per modello su tutte le frontiere in attesa."""
+        groups = defaultdict(list)
+        for session, future in pending:
+            candidates = session.ai._guess_candidates()
+            if not candidates:
+                future.set_result(None)
+                continue
+            groups[id(session.ai.model)].append((session, future, candidates))
+
+        for jobs in groups.values():
+            ai = jobs[0][0].ai
+            features = []
+            for session, _, candidates in jobs:
+                features.extend(session.ai._get_features_for_cell(r, c) for r, c in candidates)
+            safe_probs = ai._predict_safe(features)
+            start = 0
+            for session, future, candidates in jobs:
+                move_features = None
+                if safe_probs is not None:
+                    best = int(safe_probs[start:start + len(candidates)].argmax())
+                    move = candidates[best]
+                    move_features = features[start + best]
+                else:
+                    move = random.choice(candidates)
+                start += len(candidates)
+                session.ai._execute_guess(move, move_features)
+                future.set_result(move)
+
+
+async def serve(host='127.0.0.1', port=8765, path=None, dataset_file=None, brain_file=None,
+                guess_sweeps=50):
+    server = GameServer(dataset_file=dataset_file, brain_file=brain_file, guess_sweeps=guess_sweeps)
+    listener = await server.start(host, port, path)
+    where = path or f"{host}:{port}"
+    print(f"Game server in ascolto su {where}")
+    async with listener:
+        await listener.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Server asyncio per partite e sessioni solver.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', default=None, help="percorso di un socket Unix al posto di TCP")
+    parser.add_argument('--dataset', default=None, help="CSV in cui accodare i dati dei guess (default: nessuno)")
+    parser.add_argument('--brain', default=None, help="file in cui salvare la rete MLP dopo ogni partita (default: nessuno)")
+    parser.add_argument('--guess-sweeps', type=int, default=50, help="sweep Monte-Carlo per guess del solver logico")
+    args = parser.parse_args()
+    asyncio.run(serve(args.host, args.port, args.unix, args.dataset, args.brain, args.guess_sweeps))
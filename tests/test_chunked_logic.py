@@ -0,0 +1,66 @@
+import os
+import random
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game.chunked_logic import ChunkedMinesweeperLogic
+from ai.solver import MinesweeperAI
+
+
+def test_solver_only_touches_explored_chunks():
+    random.seed(0)
+    game = ChunkedMinesweeperLogic(1000, 1000, 150000, seed=3)
+    ai = MinesweeperAI(game, csv_filename=None)
+    ai.guess_max_sweeps = 20
+    game.reveal(500, 500)
+    for _ in range(3):
+        ai.step()
+    assert len(game._chunks) < 20
+
+
+def test_clone_copies_only_explored_chunks():
+    game = ChunkedMinesweeperLogic(1000, 1000, 150000, seed=5)
+    game.reveal(500, 500)
+    other = game.clone()
+    assert set(other._chunks) == set(game._chunks)
+    assert other.moves == game.moves and other.revealed_count == game.revealed_count
+
+    # Le due partite proseguono in modo indipendente e con lo stesso layout
+    hidden = next(cell for _, cell in game.known_cells() if not cell.is_revealed)
+    other.toggle_flag(hidden.r, hidden.c)
+    assert other.get_cell(hidden.r, hidden.c).is_flagged
+    assert not game.get_cell(hidden.r, hidden.c).is_flagged
+    assert other.get_cell(10, 10).is_mine == game.get_cell(10, 10).is_mine
+    assert other.get_cell(10, 10) is not game.get_cell(10, 10)
+
+
+def _check_layout(game):
+    for cid, cells in game._chunks.items():
+        for cell in cells:
+            assert cell.is_mine == game._has_mine(cell.r, cell.c)
+            if not cell.is_mine:
+                expected = sum(game._has_mine(nr, nc) for nr, nc in game.get_neighbors(cell.r, cell.c))
+                assert cell.adjacent_mines == expected, (cell.r, cell.c)
+
+
+def test_layout_is_consistent_across_chunks():
+    for rows, cols, mines, chunk_size, click in ((300, 300, 18000, 32, (150, 150)),
+                                                (100, 70, 1500, 16, (0, 69)),
+                                                (50, 50, 2400, 8, (31, 32))):
+        game = ChunkedMinesweeperLogic(rows, cols, mines, chunk_size=chunk_size, seed=rows)
+        game.reveal(*click)
+
+        # Zona sicura del primo click
+        r, c = click
+        for nr in range(max(0, r - 1), min(rows, r + 2)):
+            for nc in range(max(0, c - 1), min(cols, c + 2)):
+                assert not game._has_mine(nr, nc)
+
+        # Alcune chunk in più, anche sui bordi e negli angoli della griglia
+        for r, c in ((0, 0), (rows - 1, cols - 1), (rows // 2, 0), (chunk_size, chunk_size - 1)):
+            game.get_cell(r, c)
+        _check_layout(game)
+
+        # Totale esatto: le mine di tutte le chunk sommano a mines
+        assert sum(len(game._mines_of_chunk(cid)) for cid in range(game.n_chunks)) == mines
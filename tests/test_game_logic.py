@@ -0,0 +1,65 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game.game_logic import MinesweeperLogic
+from ai.sampling import MonteCarloEstimator
+
+
+def _fresh_counts(game):
+    """Numeri ricalcolati da zero dal layout attuale (0 sulle mine, come _compute_numbers)."""
+    counts = []
+    for cell in game.cells:
+        if cell.is_mine:
+            counts.append(0)
+        else:
+            counts.append(sum((nr, nc) in game.mine_positions for nr, nc in game.get_neighbors(cell.r, cell.c)))
+    return counts
+
+
+def _state(game):
+    return [(cell.is_mine, cell.is_revealed, cell.is_flagged, cell.adjacent_mines) for cell in game.cells]
+
+
+def test_hypothetical_mines_keep_counts_consistent():
+    for seed in range(20):
+        game = MinesweeperLogic(16, 16, 40, seed=seed)
+        game.reveal(8, 8)
+        before = _state(game)
+        base = game.snapshot()
+
+        layouts = MonteCarloEstimator(game).sample_layouts(10)
+        for layout in layouts:
+            game.set_hypothetical_mines(layout)
+            assert all(game.board[r][c].is_mine for r, c in layout)
+            assert [cell.adjacent_mines for cell in game.cells] == _fresh_counts(game)
+            game.rollback(base)
+            assert _state(game) == before
+
+
+def test_rollback_restores_moves_and_layouts():
+    game = MinesweeperLogic(16, 16, 40, seed=3)
+    game.reveal(8, 8)
+    before = _state(game)
+    moves = list(game.moves)
+    token = game.snapshot()
+
+    hidden = [(cell.r, cell.c) for cell in game.cells if not cell.is_revealed]
+    game.set_hypothetical_mines(hidden[:40])
+    game.toggle_flag(*hidden[0])
+    game.reveal_many(hidden[40:60])
+    game.rollback(token)
+
+    assert _state(game) == before
+    assert game.moves == moves
+    assert [cell.adjacent_mines for cell in game.cells] == _fresh_counts(game)
+
+
+def test_rollback_before_first_click():
+    game = MinesweeperLogic(9, 9, 10, seed=1)
+    token = game.snapshot()
+    game.reveal(4, 4)
+    game.rollback(token)
+    assert game.first_click and not game.mine_positions
+    assert all(not cell.is_mine and cell.adjacent_mines == 0 for cell in game.cells)
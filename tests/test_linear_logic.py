@@ -0,0 +1,47 @@
+import itertools
+import os
+import random
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ai.linear_logic import solve_component
+
+
+def _forced_by_enumeration(component):
+    """Celle con lo stesso valore in tutte le soluzioni (forza bruta)."""
+    cells = sorted({cell for hidden, _ in component for cell in hidden})
+    values = None
+    for assignment in itertools.product((0, 1), repeat=len(cells)):
+        mines = {cell for cell, v in zip(cells, assignment) if v}
+        if all(len(hidden & mines) == remaining for hidden, remaining in component):
+            current = dict(zip(cells, assignment))
+            values = current if values is None else {c: v for c, v in values.items() if current[c] == v}
+    return values or {}
+
+
+def test_deductions_are_sound():
+    rng = random.Random(0)
+    for _ in range(200):
+        cells = [(0, i) for i in range(rng.randint(3, 10))]
+        mines = {c for c in cells if rng.random() < 0.4}
+        component = []
+        for _ in range(rng.randint(2, 6)):
+            hidden = frozenset(rng.sample(cells, rng.randint(1, min(4, len(cells)))))
+            component.append((hidden, len(hidden & mines)))
+        forced = _forced_by_enumeration(component)
+        safe, found_mines = solve_component(component)
+        for cell in safe:
+            assert forced.get(cell) == 0
+        for cell in found_mines:
+            assert forced.get(cell) == 1
+
+
+def test_long_chain_uses_sparse_elimination():
+    # 3201 celle: oltre FULL_REDUCTION_LIMIT, deve restare veloce e trovare le stesse deduzioni
+    n = 1600
+    component = [(frozenset({(0, i), (0, i + 1), (1, i)}), 1) for i in range(n)]
+    component.append((frozenset({(0, 0)}), 1))
+    safe, mines = solve_component(component)
+    assert mines == {(0, 0)}
+    assert safe == {(0, 1), (1, 0)}
@@ -0,0 +1,17 @@
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game.game_logic import MinesweeperLogic
+
+
+def test_first_click_is_bounded():
+    for mines, verified in ((99, True), (170, False)):
+        t0 = time.perf_counter()
+        game = MinesweeperLogic(16, 30, mines, no_guess=True, seed=1)
+        game.reveal(8, 15)
+        assert time.perf_counter() - t0 < 5
+        assert game.no_guess_verified == verified
+        assert len(game.mine_positions) == mines
@@ -0,0 +1,71 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ai.patterns import (NEIGHBOR_OFFSETS, PAIR_OFFSETS, PAIR_WINDOWS, _build_pair,
+                         _build_single, build_tables, load_tables)
+
+
+def _forced_by_enumeration(mask, regions):
+    """Per ogni tupla di conteggi (mine in ciascuna regione), le celle di mask
+    sicure e quelle minate in tutte le assegnazioni con quei conteggi (forza
+    bruta sui sottoinsiemi di mask)."""
+    forced = {}
+    sub = mask
+    while True:
+        key = tuple(bin(sub & region).count('1') for region in regions)
+        safe, mines = forced.get(key, (mask, mask))
+        forced[key] = (safe & ~sub, mines & sub)
+        if sub == 0:
+            break
+        sub = (sub - 1) & mask
+    return forced
+
+
+def _check(table, index, forced, mask, values):
+    entry = table[index]
+    if values not in forced:
+        # Nessuna soluzione: la voce non deve toccare celle fuori da mask
+        assert entry & ~(mask | mask << 16) == 0
+        return
+    safe, mines = forced[values]
+    assert entry & 0xFFFF == safe, (mask, values)
+    assert entry >> 16 == mines, (mask, values)
+
+
+def test_single_table_matches_enumeration():
+    table = _build_single()
+    full = (1 << len(NEIGHBOR_OFFSETS)) - 1
+    for mask in range(256):
+        forced = _forced_by_enumeration(mask, [full])
+        for a in range(9):
+            _check(table, mask * 9 + a, forced, mask, (a,))
+
+
+def test_pair_tables_match_enumeration():
+    for offset in PAIR_OFFSETS:
+        dr, dc = offset
+        window = PAIR_WINDOWS[offset]
+        region_a = sum(1 << i for i, (r, c) in enumerate(window) if max(abs(r), abs(c)) == 1)
+        region_b = sum(1 << i for i, (r, c) in enumerate(window) if max(abs(r - dr), abs(c - dc)) == 1)
+        table = _build_pair(offset)
+        for mask in range(1 << len(window)):
+            forced = _forced_by_enumeration(mask, [region_a, region_b])
+            for a in range(9):
+                for b in range(9):
+                    _check(table, (mask * 9 + a) * 9 + b, forced, mask, (a, b))
+
+
+def test_tables_round_trip_through_file(tmp_path):
+    path = str(tmp_path / 'pattern_table.bin')
+    built = build_tables(path)
+    assert os.listdir(tmp_path) == ['pattern_table.bin']
+
+    import ai.patterns as patterns
+    cached, patterns._TABLES = patterns._TABLES, None
+    try:
+        loaded = load_tables(path)
+    finally:
+        patterns._TABLES = cached
+    assert all(loaded[key] == built[key] for key in built)
@@ -0,0 +1,35 @@
+import os
+import random
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game.game_logic import MinesweeperLogic
+from ai import sampling
+from ai.sampling import MonteCarloEstimator
+
+
+def _estimator(seed=3, rng_seed=0):
+    game = MinesweeperLogic(16, 16, 40, seed=seed)
+    game.reveal(8, 8)
+    return MonteCarloEstimator(game, rng=random.Random(rng_seed))
+
+
+def test_mine_list_matches_state():
+    est = _estimator()
+    for _ in range(2000):
+        est._propose()
+        assert sorted(est.mine_vars) == [j for j, v in enumerate(est.state) if v]
+        assert all(est.mine_vars[est._mine_pos[j]] == j for j in est.mine_vars)
+
+
+def test_batches_grow_with_samples():
+    est = _estimator()
+    est.run(max_sweeps=50)
+    if est.batch_size < sampling.MIN_BATCH_SIZE:
+        assert est.stderr() == {}
+    est.run(max_sweeps=5000)
+    assert est.batch_size >= sampling.MIN_BATCH_SIZE
+    assert sampling.MIN_BATCHES <= len(est.batches) < 2 * max(sampling.MIN_BATCHES, est.batch_size)
+    assert len(est.batches) * est.batch_size <= est.samples
+    assert set(est.stderr()) == set(est.cells)
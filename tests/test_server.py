@@ -0,0 +1,73 @@
+import asyncio
+import json
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from server.game_server import GameServer
+from server.client import GameClient
+
+
+async def _with_client(body):
+    server = GameServer()
+    listener = await server.start(port=0)
+    port = listener.sockets[0].getsockname()[1]
+    client = await GameClient.connect(port=port)
+    try:
+        await body(client)
+    finally:
+        await client.close()
+        listener.close()
+        await listener.wait_closed()
+        server._batcher.cancel()
+
+
+def test_sessions_through_client():
+    async def body(client):
+        for solver in ('logic', 'ml'):
+            sid = (await client.request('new', rows=9, cols=9, mines=10, solver=solver))['session']
+            state = await client.request('reveal', session=sid, r=4, c=4)
+            assert state['revealed'] > 0
+
+            solved = await client.request('solve', session=sid)
+            # 'revealed' resta il totale della partita, il riepilogo sta sotto 'solve'
+            assert solved['revealed'] == (await client.request('state', session=sid))['revealed']
+            assert solved['revealed'] >= state['revealed']
+            assert set(solved['solve']) == {'passes', 'revealed', 'flagged', 'needs_guess'}
+
+            final = await client.request('play', session=sid)
+            assert final['game_over']
+            assert (await client.request('close', session=sid))['session'] == sid
+
+        metrics = await client.request('metrics')
+        assert metrics['games_finished'] == 2
+        assert metrics['sessions'] == 0
+        assert {'new', 'reveal', 'solve', 'play', 'close'} <= set(metrics['ops'])
+
+    asyncio.run(_with_client(body))
+
+
+def test_errors_keep_the_connection():
+    async def body(client):
+        try:
+            await client.request('nonexistent')
+            assert False, "operazione sconosciuta accettata"
+        except RuntimeError as e:
+            assert 'nonexistent' in str(e)
+
+        client.writer.write(b'{not json\n')
+        await client.writer.drain()
+        reply = json.loads(await client.reader.readline())
+        assert reply['ok'] is False and reply['id'] is None
+
+        try:
+            await client.request('reveal', session=12345, r=0, c=0)
+            assert False, "sessione inesistente accettata"
+        except RuntimeError:
+            pass
+
+        # La connessione è ancora utilizzabile
+        assert 'session' in await client.request('new', rows=9, cols=9, mines=10)
+
+    asyncio.run(_with_client(body))